@@ -0,0 +1,224 @@
+import json
+import pytest
+import requests
+import pandas as pd
+from wrangles.connectors import ckan
+
+
+_host = "https://data.example.com"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Ensure each test starts without cached dataset metadata
+    """
+    ckan._clear_packages_cache()
+    yield
+    ckan._clear_packages_cache()
+
+
+def _response(mocker, status_code=200, json_data=None, content=b""):
+    """
+    Create a mock response that can also be used as a context manager
+    """
+    response = mocker.MagicMock(status_code=status_code, content=content)
+    response.json.return_value = json_data
+    response.iter_content.return_value = [content]
+    response.__enter__.return_value = response
+    if status_code != 200:
+        response.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+    return response
+
+
+def _package_show(mocker, names):
+    """
+    Mock response for package_show with a resource for each name
+    """
+    return _response(mocker, json_data={
+        "result": {
+            "resources": [
+                {"name": name, "id": f"id-{name}", "url": f"{_host}/files/{name}"}
+                for name in names
+            ]
+        }
+    })
+
+
+def _mock_get(mocker, names, files=None):
+    """
+    Patch the session's get to return package_show metadata
+    or the contents of a file depending on the url.
+    Returns the function with the requested urls as .urls
+    """
+    files = files or {}
+    def get(url, **kwargs):
+        get.urls.append(url)
+        if "package_show" in url:
+            return _package_show(mocker, names)
+        return _response(mocker, content=files[url.split("/")[-1]])
+    get.urls = []
+    mocker.patch.object(ckan._session, "get", side_effect=get)
+    return get
+
+
+def test_read_list(mocker):
+    """
+    Test reading a list of files returns a dataframe for each
+    """
+    _mock_get(mocker, ["a.csv", "b.csv"], {
+        "a.csv": b"col\n1\n2\n",
+        "b.csv": b"col\n3\n",
+    })
+    dfs = ckan.read(_host, "my-dataset", ["a.csv", "b.csv"])
+    assert (
+        len(dfs) == 2 and
+        dfs[0]["col"].tolist() == [1, 2] and
+        dfs[1]["col"].tolist() == [3]
+    )
+
+
+def test_read_file_not_found(mocker):
+    """
+    Test that a missing file raises an error after
+    refreshing the cached metadata
+    """
+    get = _mock_get(mocker, ["a.csv"])
+    with pytest.raises(ValueError, match="File not found"):
+        ckan.read(_host, "my-dataset", "missing.csv")
+    assert len(get.urls) == 2
+
+
+def test_read_uses_cached_metadata(mocker):
+    """
+    Test that dataset metadata is only requested
+    once for repeated reads
+    """
+    get = _mock_get(mocker, ["a.csv"], {"a.csv": b"col\n1\n"})
+    ckan.read(_host, "my-dataset", "a.csv")
+    ckan.read(_host, "my-dataset", "a.csv")
+    package_calls = [x for x in get.urls if "package_show" in x]
+    assert len(package_calls) == 1
+
+
+def test_write_clears_cache(mocker):
+    """
+    Test that writing a file refreshes the
+    cached metadata for the next read
+    """
+    get = _mock_get(mocker, ["a.csv"], {"a.csv": b"col\n1\n"})
+    post = mocker.patch.object(ckan._session, "post", return_value=_response(mocker))
+    ckan.read(_host, "my-dataset", "a.csv")
+    ckan.write(pd.DataFrame({"col": [1]}), _host, "my-dataset", "a.csv", "key")
+    ckan.read(_host, "my-dataset", "a.csv")
+    package_calls = [x for x in get.urls if "package_show" in x]
+    assert (
+        len(package_calls) == 3 and
+        post.call_args.kwargs["url"].endswith("resource_update") and
+        post.call_args.kwargs["data"] == {"id": "id-a.csv"}
+    )
+
+
+def test_upload_revise(mocker, tmp_path):
+    """
+    Test that uploading several files sends
+    a single package_revise request
+    """
+    (tmp_path / "a.csv").write_bytes(b"a")
+    (tmp_path / "b.csv").write_bytes(b"b")
+    _mock_get(mocker, ["a.csv"])
+    post = mocker.patch.object(ckan._session, "post", return_value=_response(mocker))
+
+    ckan.upload.run(
+        _host,
+        "my-dataset",
+        "key",
+        [str(tmp_path / "a.csv"), str(tmp_path / "b.csv")],
+        ["a.csv", "b.csv"]
+    )
+    kwargs = post.call_args.kwargs
+    assert (
+        post.call_count == 1 and
+        kwargs["url"] == f"{_host}/api/action/package_revise" and
+        kwargs["data"] == {
+            "match__name": "my-dataset",
+            "update__resources__extend": json.dumps([{"name": "b.csv"}])
+        } and
+        kwargs["files"] == {
+            "update__resources__id-a.csv__upload": ("a.csv", b"a"),
+            "update__resources__-1__upload": ("b.csv", b"b"),
+        }
+    )
+
+
+def test_upload_revise_fallback(mocker, tmp_path):
+    """
+    Test that files are uploaded individually if
+    the server doesn't accept package_revise
+    """
+    (tmp_path / "a.csv").write_bytes(b"a")
+    (tmp_path / "b.csv").write_bytes(b"b")
+    _mock_get(mocker, ["a.csv"])
+    post = mocker.patch.object(
+        ckan._session,
+        "post",
+        side_effect=lambda url, **kwargs: _response(
+            mocker,
+            status_code=404 if url.endswith("package_revise") else 200
+        )
+    )
+
+    ckan.upload.run(
+        _host,
+        "my-dataset",
+        "key",
+        [str(tmp_path / "a.csv"), str(tmp_path / "b.csv")],
+        ["a.csv", "b.csv"]
+    )
+    urls = sorted(x.kwargs["url"] for x in post.call_args_list)
+    assert urls == [
+        f"{_host}/api/action/package_revise",
+        f"{_host}/api/action/resource_create",
+        f"{_host}/api/action/resource_update",
+    ]
+
+
+def test_upload_clears_cache(mocker, tmp_path):
+    """
+    Test that uploading a file refreshes the
+    cached metadata even if the upload fails
+    """
+    (tmp_path / "a.csv").write_bytes(b"a")
+    get = _mock_get(mocker, ["a.csv"])
+    mocker.patch.object(ckan._session, "post", return_value=_response(mocker, status_code=500))
+
+    with pytest.raises(RuntimeError, match="Upload to CKAN Failed"):
+        ckan.upload.run(_host, "my-dataset", "key", str(tmp_path / "a.csv"), "a.csv")
+    ckan._get_packages_in_dataset(_host, "my-dataset", "key")
+    assert len(get.urls) == 2
+
+
+def test_download(mocker, tmp_path):
+    """
+    Test downloading a file to the local file system
+    """
+    _mock_get(mocker, ["a.csv"], {"a.csv": b"col\n1\n"})
+    output = tmp_path / "a.csv"
+    ckan.download.run(_host, "my-dataset", "a.csv", output_file=str(output))
+    assert output.read_bytes() == b"col\n1\n"
+
+
+def test_download_error_status(mocker, tmp_path):
+    """
+    Test that an error response isn't saved as the file
+    """
+    def get(url, **kwargs):
+        if "package_show" in url:
+            return _package_show(mocker, ["a.csv"])
+        return _response(mocker, status_code=404, content=b"Not Found")
+    mocker.patch.object(ckan._session, "get", side_effect=get)
+
+    output = tmp_path / "a.csv"
+    with pytest.raises(requests.HTTPError):
+        ckan.download.run(_host, "my-dataset", "a.csv", output_file=str(output))
+    assert not output.exists()
@@ -79,3 +79,34 @@ def test_read_union():
         df["header1"].values.tolist() == ["a", "b", "c", "d"] and
         len(df) == 4
     )
+
+def test_read_union_single_source_unchanged():
+    """
+    Test that a union of only the input doesn't
+    modify the caller's dataframe
+    """
+    data = pd.DataFrame({
+        "header1": ["a", "b"],
+    })
+    df = wrangles.recipe.run(
+        """
+        read:
+          - union:
+              sources:
+                - input
+        wrangles:
+          - convert.case:
+              input: header1
+              case: upper
+          - merge.concatenate:
+              input: header1
+              output: header2
+              char: ''
+        """,
+        dataframe=data
+    )
+    assert (
+        df["header1"].tolist() == ["A", "B"] and
+        data["header1"].tolist() == ["a", "b"] and
+        data.columns.tolist() == ["header1"]
+    )
@@ -1,4 +1,5 @@
 import wrangles
+import random
 from datetime import datetime
 
 
@@ -175,4 +176,46 @@ def test_random_list_numbers():
             random_list: <random([1, 2])>
     """
     df = wrangles.recipe.run(recipe)
-    assert df["random_list"][0] == 1 or df["random_list"][0] == 2
\ No newline at end of file
+    assert df["random_list"][0] == 1 or df["random_list"][0] == 2
+
+def test_random_values_reproducible():
+    """
+    Test that seeding the random module
+    gives the same generated values
+    """
+    recipe = """
+    read:
+      - test:
+          rows: 10
+          values:
+            code: <code>
+            int: <int(1-1000)>
+            number: <number(0.00-1.00)>
+            char: <char>
+            boolean: <boolean>
+    """
+    random.seed(42)
+    df1 = wrangles.recipe.run(recipe)
+    random.seed(42)
+    df2 = wrangles.recipe.run(recipe)
+    assert df1.equals(df2) and len(df1['code'][0]) == 8
+
+def test_columns_with_where():
+    """
+    Test that where can reference a column
+    that isn't in the selected columns
+    """
+    recipe = """
+    read:
+      - test:
+          rows: 3
+          columns:
+            - a
+          where: b = 'x'
+          order_by: b
+          values:
+            a: 1
+            b: x
+    """
+    df = wrangles.recipe.run(recipe)
+    assert df.columns.tolist() == ['a'] and df['a'].tolist() == [1, 1, 1]
@@ -1,4 +1,6 @@
 import uuid
+import random
+import string
 
 from pytest_mock import mocker
 
@@ -17,6 +19,12 @@ class LogCapture(logging.Handler):
     def get_messages(self):
         return [self.format(r) for r in self.records]
 
+# Alphabet as bytes so random suffixes can be built without joining single chars
+_suffix_alphabet = (string.ascii_letters + string.digits).encode('ascii')
+
+def _random_suffix(k: int = 6) -> str:
+    return bytes(random.choices(_suffix_alphabet, k=k)).decode('ascii')
+
 #
 # Classify
 #
@@ -53,6 +61,88 @@ def test_classify_write():
     df = wrangles.recipe.run(recipe, dataframe=data)
     assert len(df) == 3
 
+def test_classify_write_rows(mocker):
+    """
+    Check the training data is sent as a list of rows
+    with only the required columns in order
+    """
+    m = mocker.patch("wrangles.train.train.classify")
+    wrangles.recipe.run(
+        """
+        write:
+          - train.classify:
+              model_id: 94674750-f9e1-44af
+        """,
+        dataframe=pd.DataFrame({
+            'Example': ['rice', 'milk'],
+            'Category': ['Grains', 'Dairy'],
+            'Notes': ['', 1],
+            'Other': ['x', 'y']
+        })
+    )
+    assert m.call_args[0][0] == [['rice', 'Grains', ''], ['milk', 'Dairy', 1]]
+
+def test_classify_generator_training_data(mocker):
+    """
+    Check training data can be provided as a generator of rows
+    """
+    mocker.patch("wrangles.auth.get_access_token", return_value="token")
+    m = mocker.patch("requests.post")
+    wrangles.train.classify(
+        (row for row in [['rice', 'Grains', ''], ['milk', 'Dairy', '']]),
+        name='test'
+    )
+    assert m.call_args.kwargs['json'] == [
+        ['Example', 'Category', 'Notes'],
+        ['rice', 'Grains', ''],
+        ['milk', 'Dairy', '']
+    ]
+
+def test_classify_invalid_rows_reported(mocker):
+    """
+    Check every invalid row is reported, including duplicates
+    """
+    with pytest.raises(ValueError, match=r"Check element\(s\) \[1, 2\]"):
+        wrangles.train.classify(
+            [['rice', 'Grains', ''], ['', 'Dairy', ''], ['', 'Dairy', '']],
+            name='test'
+        )
+
+def test_classify_write_empty(mocker):
+    """
+    Check an empty dataframe doesn't call the training API
+    """
+    m = mocker.patch("wrangles.train.train.classify")
+    wrangles.recipe.run(
+        """
+        write:
+          - train.classify:
+              model_id: 94674750-f9e1-44af
+        """,
+        dataframe=pd.DataFrame(columns=['Example', 'Category', 'Notes'])
+    )
+    assert m.call_count == 0
+
+def test_classify_write_empty_new_model(mocker, caplog):
+    """
+    Check an empty dataframe still creates
+    a new model and warns that it is empty
+    """
+    m = mocker.patch("wrangles.train.train.classify")
+    wrangles.recipe.run(
+        """
+        write:
+          - train.classify:
+              name: test
+        """,
+        dataframe=pd.DataFrame(columns=['Example', 'Category', 'Notes'])
+    )
+    assert (
+        m.call_count == 1 and
+        m.call_args.args[1] == 'test' and
+        "creating an empty model" in caplog.text
+    )
+
 def test_classify_write_2():
     """
     Train with incorrect columns
@@ -1106,9 +1196,7 @@ class TestTrainLookup:
         """
         Test UPDATE with simple MatchingColumns as a string
         """
-        import random
-        import string
-        suffix = ''.join(random.choices(string.ascii_letters + string.digits, k=6))
+        suffix = _random_suffix()
         df = pd.DataFrame({
                 "City": [f"London"],
                 "Country": [f"UK"],
@@ -1137,9 +1225,7 @@ class TestTrainLookup:
         """
         Test UPDATE with multiple MatchingColumns as a list
         """
-        import random
-        import string
-        suffix = ''.join(random.choices(string.ascii_letters + string.digits, k=6))
+        suffix = _random_suffix()
         df = pd.DataFrame({
                 "City": [f"Paris"],
                 "Country": [f"France"],
@@ -1170,9 +1256,7 @@ class TestTrainLookup:
         """
         Test INSERT with multiple MatchingColumns as a string
         """
-        import random
-        import string
-        suffix = ''.join(random.choices(string.ascii_letters + string.digits, k=6))
+        suffix = _random_suffix()
         df = pd.DataFrame({
                 "City": [f"City {suffix}", "London"],
                 "Country": [f"UK {suffix}", "UK {suffix}"],
@@ -1200,9 +1284,7 @@ class TestTrainLookup:
         """
         Test INSERT with multiple MatchingColumns as a list
         """
-        import random
-        import string
-        suffix = ''.join(random.choices(string.ascii_letters + string.digits, k=6))
+        suffix = _random_suffix()
         df = pd.DataFrame({
                 "City": [f"City {suffix}", "Paris"],
                 "Country": [f"UK {suffix}", "France"],
@@ -1231,9 +1313,7 @@ class TestTrainLookup:
         """
         Test UPSERT with single MatchingColumns as a string
         """
-        import random
-        import string
-        suffix = ''.join(random.choices(string.ascii_letters + string.digits, k=6))
+        suffix = _random_suffix()
         df = pd.DataFrame({
                 "City": [f"City {suffix}", "Portland"],
                 "Country": [f"UK {suffix}", f"USA {suffix}"],
@@ -1260,9 +1340,7 @@ class TestTrainLookup:
         """
         Test UPSERT with multiple MatchingColumns as a list
         """
-        import random
-        import string
-        suffix = ''.join(random.choices(string.ascii_letters + string.digits, k=6))
+        suffix = _random_suffix()
         df = pd.DataFrame({
                 "City": [f"City {suffix}", "London", "Seattle"],
                 "Country": [f"UK {suffix}", "UK", "USA"],
@@ -1464,6 +1542,25 @@ def test_standardize_write_1():
     )
     assert df.iloc[0]['Find'] == 'ASAP'
 
+def test_standardize_write_empty(mocker):
+    """
+    Check an empty dataframe doesn't call the training API
+    """
+    m = mocker.patch("wrangles.train.train.standardize")
+    wrangles.recipe.run(
+        """
+        write:
+        - train.standardize:
+            columns:
+                - Find
+                - Replace
+                - Notes
+            model_id: fc7d46e3-057f-47bd
+        """,
+        dataframe=pd.DataFrame(columns=['Find', 'Replace', 'Notes'])
+    )
+    assert m.call_count == 0
+
 def test_standardize_write_2():
     """
     Write standardize with incorrect columns
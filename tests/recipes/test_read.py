@@ -208,8 +208,8 @@ def test_read_order_by():
         """
     )
     assert (
-        df.tail(1)["header"].iloc[0] == max(df["header"].values)
-        and df.head(1)["header"].iloc[0] == min(df["header"].values)
+        df.tail(1)["header"].iloc[0] == df["header"].max()
+        and df.head(1)["header"].iloc[0] == df["header"].min()
     )
 
 def test_multiple_reads():
@@ -229,7 +229,7 @@ def test_multiple_reads():
                 header: value2
         """
     )
-    assert list(df['header'].values) == ['value1', 'value2']
+    assert df['header'].tolist() == ['value1', 'value2']
 
 def test_read_single_plus_aggregate():
     """
@@ -256,7 +256,35 @@ def test_read_single_plus_aggregate():
                 header: value3
         """
     )
-    assert list(df['header'].values) == ['value1', 'value2', 'value3']
+    assert df['header'].tolist() == ['value1', 'value2', 'value3']
+
+def test_union_seeded_is_deterministic():
+    """
+    Test that a union of test sources returns
+    the same data for the same random seed
+    """
+    import random
+
+    recipe = """
+    read:
+      - union:
+          sources:
+    """ + "".join([
+        """
+            - test:
+                rows: 5
+                values:
+                  header: <number(1-1000000)>
+        """
+        for _ in range(8)
+    ])
+
+    random.seed(1)
+    df1 = wrangles.recipe.run(recipe)
+    random.seed(1)
+    df2 = wrangles.recipe.run(recipe)
+    assert len(df1) == 40
+    assert df1['header'].tolist() == df2['header'].tolist()
 
 def test_all_if_false():
     """
@@ -279,6 +307,27 @@ def test_all_if_false():
     )
     assert isinstance(df, pd.DataFrame) and df.empty
 
+def test_some_if_false():
+    """
+    Test that a read with a false if condition
+    does not prevent the other reads from running
+    """
+    df = wrangles.recipe.run(
+        """
+        read:
+          - test:
+              if: 1 == 2
+              rows: 1
+              values:
+                header: value1
+          - test:
+              rows: 1
+              values:
+                header: value2
+        """
+    )
+    assert df['header'].tolist() == ['value2']
+
 def test_overwrite_read():
     """
     Test using a custom function to overwrite a standard connector for read
@@ -37,6 +37,28 @@ def test_recipe_from__recipe_file():
     )
     assert df.columns.tolist() == ['ID', 'Find2']
 
+def test_recipe_from_dict():
+    """
+    Testing recipe passed as a pre-parsed dict
+    is not modified by running it
+    """
+    recipe = {
+        "read": [{"test": {"rows": 2, "values": {"header": "${value}"}}}],
+        "wrangles": [{"convert.case": {"input": "header", "case": "upper"}}]
+    }
+    df = wrangles.recipe.run(recipe, variables={"value": "a"})
+    assert (
+        df['header'].tolist() == ['A', 'A'] and
+        recipe['read'][0]['test']['values']['header'] == "${value}"
+    )
+
+def test_recipe_invalid_type():
+    """
+    Testing a recipe passed as an unsupported type
+    """
+    with pytest.raises(ValueError, match="invalid type"):
+        wrangles.recipe.run(123)
+
 def test_recipe_from_url():
     """
     Testing reading a recipe from an https:// source
@@ -636,6 +658,38 @@ class TestColumnWildcards:
             "col2": "new_2"
         }
 
+    def test_get_nested_function_custom_priority(self):
+        """
+        Test that custom functions take priority over stock
+        functions and private stock names are not exposed
+        """
+        def csv():
+            return 'custom'
+
+        assert (
+            wrangles.utils.get_nested_function(
+                'csv', wrangles.connectors, {'csv': csv}
+            ) is csv and
+            wrangles.utils.get_nested_function(
+                'file', wrangles.connectors, {'csv': csv}, 'read'
+            ) is wrangles.connectors.file.read
+        )
+        with pytest.raises(ValueError, match='not recognized'):
+            wrangles.utils.get_nested_function(
+                '_logging', wrangles.connectors, {'csv': csv}
+            )
+
+    def test_wildcard_expansion_dict_regex_inline_flags(self):
+        """
+        Test wildcard expansion on a dict with an unrenamed
+        regex that starts with inline flags
+        """
+        columns = wrangles.utils.wildcard_expansion_dict(
+            ["Col1","col2","other"],
+            {"regex:(?i)col\\d": "regex:(?i)col\\d"}
+        )
+        assert columns == {"Col1": "Col1", "col2": "col2"}
+
     def test_wildcard_not(self):
         """
         Test wildcard that uses a not column
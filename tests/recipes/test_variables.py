@@ -365,3 +365,20 @@ def test_variables_variable_overwrite():
         variables={'recipe_variables': 'This is a string'}
     )
     assert isinstance(df['vars'][0], dict)
+
+
+def test_same_recipe_different_variables():
+    """
+    Test that running an identical recipe repeatedly
+    uses the variables passed to each run
+    """
+    recipe = """
+    read:
+      - test:
+          rows: 1
+          values:
+            header: ${value}
+    """
+    df1 = wrangles.recipe.run(recipe, variables={'value': 'first'})
+    df2 = wrangles.recipe.run(recipe, variables={'value': 'second'})
+    assert df1['header'][0] == 'first' and df2['header'][0] == 'second'
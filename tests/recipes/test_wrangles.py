@@ -192,6 +192,30 @@ class TestWhere:
         )
         assert df["column"][0] == "A" and df["column"][20] == ["bad", "list"]
 
+    def test_where_unreferenced_mixed_column(self):
+        """
+        Test that columns not used by the where clause
+        are not required to be compatible with sqlite
+        """
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+            - convert.case:
+                input: col2
+                case: upper
+                where: col1 = 1
+            """,
+            dataframe= pd.DataFrame({
+                'col1': [1, 2],
+                'col2': ['HeLlO', 'WoRlD'],
+                'col3': [{'a': 1}, 'text'],
+            })
+        )
+        assert (
+            df["col2"].tolist() == ["HELLO", "WoRlD"] and
+            df["col3"][0] == {'a': 1}
+        )
+
     def test_where_data_types_preserved(self):
         """
         Test that data types are preserved when using where
@@ -13,51 +13,41 @@ class TestExtractAddress:
         columns=['location']
     )
 
-    def test_address_street(self):
+    @pytest.fixture(scope="class")
+    def address_results(self):
+        """
+        Run every dataType in a single recipe
+        """
         recipe = """
         wrangles:
             - extract.address:
                 input: location
                 output: streets
                 dataType: streets
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df)
-        assert df.iloc[0]['streets'] == ['221 B Baker St.']
-        
-    def test_address_cities(self):
-        recipe = """
-        wrangles:
             - extract.address:
                 input: location
                 output: cities
                 dataType: cities
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df)
-        assert df.iloc[0]['cities'] == ['London']
-        
-    def test_address_countries(self):
-        recipe = """
-        wrangles:
-                - extract.address:
-                    input: location
-                    output: country
-                    dataType: countries
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df)
-        assert df.iloc[0]['country'] == ['United Kingdom']
-        
-    def test_address_regions(self):
-        recipe = """
-        wrangles:
+            - extract.address:
+                input: location
+                output: countries
+                dataType: countries
             - extract.address:
                 input: location
                 output: regions
                 dataType: regions
         """
-        df = wrangles.recipe.run(recipe, dataframe=self.df)
-        assert df.iloc[0]['regions'] == ['England']
-        
-    
+        return wrangles.recipe.run(recipe, dataframe=self.df)
+
+    @pytest.mark.parametrize("data_type,expected", [
+        ("streets", ['221 B Baker St.']),
+        ("cities", ['London']),
+        ("countries", ['United Kingdom']),
+        ("regions", ['England']),
+    ])
+    def test_address_data_type(self, address_results, data_type, expected):
+        assert address_results.iloc[0][data_type] == expected
+
     def test_address_5(self):
         """
         If the input is multiple columns (a list)
@@ -222,186 +212,58 @@ class TestExtractAttributes:
             'first_element must be used with a specified attribute_type' in info.value.args[0]
         )
 
-    def test_attributes_angle(self):
-        """
-        Testing Angle
-        """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: angle
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'][0] in ['13deg', '13°']
-
-    def test_attributes_area(self):
-        """
-        Testing area
-        """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: area
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'][0] in ['13m^2', '13sq m']
-
-    def test_attributes_current(self):
-        """
-        Testing Current
-        """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: current
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'] == ['13A']
-
-    def test_attributes_force(self):
-        """
-        Testing Force
-        """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: force
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'] == ['13N']
-
-    def test_attributes_length(self):
-        """
-        Testing Length
-        """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: length
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'] == ['13m']
-
-    def test_attributes_power(self):
-        """
-        Testing Power
-        """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: power
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'] == ['13hp', '13W']
-
-    def test_attributes_pressure(self):
-        """
-        Testing Pressure
-        """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: pressure
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'] == ['13psi']
-
-    def test_attributes_voltage_legacy(self):
-        """
-        Test voltage with new legacy name
-        (electric potential)
-        """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: electric potential
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'] == ['13V']
-
-    def test_attributes_voltage(self):
-        """
-        Test voltage with new name
-        """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: voltage
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'] == ['13V']
-
-    def test_attributes_volume(self):
-        """
-        Testing volume
-        """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: volume
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'][0] in ['13m^3', '13cu m']
-
-    def test_attributes_mass_legacy(self):
-        """
-        Test with legacy name for weight (mass)
+    _attribute_types = [
+        'angle', 'area', 'current', 'force', 'length', 'power', 'pressure',
+        'electric potential', 'voltage', 'volume', 'mass', 'weight'
+    ]
+
+    @pytest.fixture(scope="class")
+    def attribute_type_results(self):
+        """
+        Extract every attribute_type from df_test_attributes_all in a single recipe
+        """
+        recipe = {
+            'wrangles': [
+                {
+                    'extract.attributes': {
+                        'input': 'Tools',
+                        'output': f'Attributes {attribute_type}',
+                        'responseContent': 'span',
+                        'attribute_type': attribute_type
+                    }
+                }
+                for attribute_type in self._attribute_types
+            ]
+        }
+        return wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
+
+    @pytest.mark.parametrize("attribute_type,expected", [
+        ("current", ['13A']),
+        ("force", ['13N']),
+        ("length", ['13m']),
+        ("power", ['13hp', '13W']),
+        ("pressure", ['13psi']),
+        ("electric potential", ['13V']), # legacy name for voltage
+        ("voltage", ['13V']),
+        ("mass", ['13kg']), # legacy name for weight
+        ("weight", ['13kg']),
+    ])
+    def test_attributes_type(self, attribute_type_results, attribute_type, expected):
         """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: mass
+        Test each attribute_type returns only the matching spans
         """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'] == ['13kg']
+        assert attribute_type_results.iloc[0][f'Attributes {attribute_type}'] == expected
 
-    def test_attributes_weight(self):
+    @pytest.mark.parametrize("attribute_type,expected", [
+        ("angle", ['13deg', '13°']),
+        ("area", ['13m^2', '13sq m']),
+        ("volume", ['13m^3', '13cu m']),
+    ])
+    def test_attributes_type_alternate_symbols(self, attribute_type_results, attribute_type, expected):
         """
-        Test with new name for weight
+        Test attribute_types where the span may use an alternate symbol
         """
-        recipe = """
-        wrangles:
-            - extract.attributes:
-                input: Tools
-                output: Attributes
-                responseContent: span
-                attribute_type: weight
-        """
-        df = wrangles.recipe.run(recipe, dataframe=self.df_test_attributes_all)
-        assert df.iloc[0]['Attributes'] == ['13kg']
+        assert attribute_type_results.iloc[0][f'Attributes {attribute_type}'][0] in expected
 
     def test_attributes_MinMidMax(self):
         """
@@ -535,6 +397,10 @@ class TestExtractCodes:
     """
     Test extract.codes
     """
+    df_codes = pd.DataFrame({
+        'col1': ['test ABC123,  mega code 56AAAJN244FTGJ3DASJDFNFJANVRIJGAOM and A133']
+    })
+
     # Input is string
     df_string = pd.DataFrame(
         [['to gain access use Z1ON0101']],
@@ -727,9 +593,6 @@ class TestExtractCodes:
         Test extract codes with a min length
         Should return only two codes that are greater than 5 in length
         """
-        data = pd.DataFrame({
-            'col1': ['test ABC123,  mega code 56AAAJN244FTGJ3DASJDFNFJANVRIJGAOM and A133']
-        })
         df = wrangles.recipe.run(
             """
             wrangles:
@@ -738,7 +601,7 @@ class TestExtractCodes:
                   output: codes
                   min_length: 5
             """,
-            dataframe=data
+            dataframe=self.df_codes.copy()
         )
         assert df['codes'][0] == ['ABC123', '56AAAJN244FTGJ3DASJDFNFJANVRIJGAOM']
 
@@ -747,9 +610,6 @@ class TestExtractCodes:
         Test extract codes with a max length
         Should return only two codes that are less than 7 in length
         """
-        data = pd.DataFrame({
-            'col1': ['test ABC123,  mega code 56AAAJN244FTGJ3DASJDFNFJANVRIJGAOM and A133']
-        })
         df = wrangles.recipe.run(
             """
             wrangles:
@@ -758,7 +618,7 @@ class TestExtractCodes:
                   output: codes
                   max_length: 7
             """,
-            dataframe=data
+            dataframe=self.df_codes.copy()
         )
         assert df['codes'][0] == ['ABC123', 'A133']
 
@@ -922,9 +782,6 @@ class TestExtractCodes:
         """
         Test extract codes with a min length with wrong params
         """
-        data = pd.DataFrame({
-            'col1': ['test ABC123,  mega code 56AAAJN244FTGJ3DASJDFNFJANVRIJGAOM and A133']
-        })
         with pytest.raises(ValueError) as info:
             wrangles.recipe.run(
             """
@@ -934,7 +791,7 @@ class TestExtractCodes:
                   output: codes
                   min_length: hello
             """,
-            dataframe=data
+            dataframe=self.df_codes.copy()
         )
         assert (
             info.typename == 'ValueError' and
@@ -946,9 +803,6 @@ class TestExtractCodes:
         """
         Test extract codes with a min length with wrong params type
         """
-        data = pd.DataFrame({
-            'col1': ['test ABC123,  mega code 56AAAJN244FTGJ3DASJDFNFJANVRIJGAOM and A133']
-        })
         with pytest.raises(ValueError) as info:
             wrangles.recipe.run(
             """
@@ -958,7 +812,7 @@ class TestExtractCodes:
                   output: codes
                   max_length: hello
             """,
-            dataframe=data
+            dataframe=self.df_codes.copy()
         )
         assert (
             info.typename == 'ValueError' and
@@ -969,9 +823,6 @@ class TestExtractCodes:
         """
         Test extract codes with a strategy with wrong params
         """
-        data = pd.DataFrame({
-            'col1': ['test ABC123,  mega code 56AAAJN244FTGJ3DASJDFNFJANVRIJGAOM and A133']
-        })
         with pytest.raises(ValueError) as info:
             wrangles.recipe.run(
             """
@@ -981,7 +832,7 @@ class TestExtractCodes:
                   output: codes
                   strategy: super-duper-strict
             """,
-            dataframe=data
+            dataframe=self.df_codes.copy()
         )
         assert (
             info.typename == 'ValueError' and
@@ -992,9 +843,6 @@ class TestExtractCodes:
         """
         Test sort with wrong params type
         """
-        data = pd.DataFrame({
-            'col1': ['test ABC123,  mega code 56AAAJN244FTGJ3DASJDFNFJANVRIJGAOM and A133']
-        })
         with pytest.raises(ValueError) as info:
             wrangles.recipe.run(
             """
@@ -1004,13 +852,69 @@ class TestExtractCodes:
                   output: codes
                   sort_order: random
             """,
-            dataframe=data
+            dataframe=self.df_codes.copy()
         )
         assert (
             info.typename == 'ValueError' and
             'extract.codes - Status Code: 400 - Bad Request. {"message": "Invalid parameter sort_order. Expected longest or shortest."} \n' in info.value.args[0]
         )
 
+    def test_extract_codes_multi_input_output_single_request(self):
+        """
+        Test that multiple input columns are
+        sent together in a single request
+        """
+        with patch(
+            "wrangles.batching.batch_unique_api_calls",
+            side_effect=lambda url, params, input_list, batch_size: [[x.upper()] for x in input_list]
+        ) as batch:
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.codes:
+                    input:
+                      - code1
+                      - code2
+                    output:
+                      - out1
+                      - out2
+                """,
+                dataframe=pd.DataFrame({
+                    'code1': ['abc-1', 'def-2'],
+                    'code2': ['ghi-3', 'abc-1']
+                })
+            )
+        assert (
+            batch.call_count == 1 and
+            df['out1'].tolist() == [['ABC-1'], ['DEF-2']] and
+            df['out2'].tolist() == [['GHI-3'], ['ABC-1']]
+        )
+
+    def test_extract_codes_skips_values_without_alphanumerics(self):
+        """
+        Test that values without letters or digits
+        are not sent and return no codes
+        """
+        with patch(
+            "wrangles.batching.batch_unique_api_calls",
+            side_effect=lambda url, params, input_list, batch_size: [[x.upper()] for x in input_list]
+        ) as batch:
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.codes:
+                    input: col
+                    output: out
+                """,
+                dataframe=pd.DataFrame({
+                    'col': ['abc-1', '', ' - ', 'def-2']
+                })
+            )
+        assert (
+            batch.call_args[0][2] == ['abc-1', 'def-2'] and
+            df['out'].tolist() == [['ABC-1'], [], [], ['DEF-2']]
+        )
+
         
 
 
@@ -1018,6 +922,14 @@ class TestExtractCustom:
     """
     Test extract.custom
     """
+    df_misspelt = pd.DataFrame({
+        'col1': ['The first one is smal', 'Second is size medum', 'Third is coton'],
+    })
+
+    df_colours = pd.DataFrame({
+        'col1': ['The first one is blue small', 'Second is green size medium', 'Third is black and the size is small'],
+    })
+
     def test_extract_custom_1(self):
         df = wrangles.recipe.run(
             """
@@ -1081,6 +993,33 @@ class TestExtractCustom:
             'Incorrect or missing values in model_id. Check format is XXXXXXXX-XXXX-XXXX' in info.value.args[0]
         )
 
+    def test_extract_custom_invalid_second_model_id(self):
+        """
+        Test that all model_ids are checked before any are run
+        """
+        with patch("wrangles.data.model") as model:
+            with pytest.raises(ValueError, match="Check format is XXXXXXXX-XXXX-XXXX"):
+                wrangles.recipe.run(
+                    """
+                    wrangles:
+                    - extract.custom:
+                        input:
+                            - col1
+                            - col2
+                        output:
+                            - out1
+                            - out2
+                        model_id:
+                            - 1eddb7e8-1b2b-4a52
+                            - noWork
+                    """,
+                    dataframe=pd.DataFrame({
+                        'col1': ['Charizard'],
+                        'col2': ['Pikachu']
+                    })
+                )
+        assert not model.called
+
     def test_extract_custom_labels(self):
         """
         Test use_labels option to group output
@@ -1515,9 +1454,6 @@ class TestExtractCustom:
         """
         Test extract.custom using extract_raw
         """
-        data = pd.DataFrame({
-            'col1': ['The first one is blue small', 'Second is green size medium', 'Third is black and the size is small'],
-        })
         recipe = """
         wrangles:
         - extract.custom:
@@ -1526,16 +1462,13 @@ class TestExtractCustom:
             extract_raw: True
             model_id: 829c1a73-1bfd-4ac0
         """
-        df = wrangles.recipe.run(recipe, dataframe=data)
+        df = wrangles.recipe.run(recipe, dataframe=self.df_colours.copy())
         assert df.iloc[0]['output'] == ['blue', 'small'] and df.iloc[2]['output'] == ['black', 'small']
 
     def test_extract_custom_raw_first_element(self):
         """
         Test extract.custom using extract_raw and first_element
         """
-        data = pd.DataFrame({
-            'col1': ['The first one is blue small', 'Second is green size medium', 'Third is black and the size is small'],
-        })
         recipe = """
         wrangles:
         - extract.custom:
@@ -1545,7 +1478,7 @@ class TestExtractCustom:
             first_element: True
             model_id: 829c1a73-1bfd-4ac0
         """
-        df = wrangles.recipe.run(recipe, dataframe=data)
+        df = wrangles.recipe.run(recipe, dataframe=self.df_colours.copy())
         assert df.iloc[0]['output'] == 'blue' and df.iloc[2]['output'] == 'black' 
 
     def test_extract_custom_raw_case_sensitive(self):
@@ -1571,9 +1504,6 @@ class TestExtractCustom:
         """
         Test extract.custom with use_spellcheck
         """
-        data = pd.DataFrame({
-            'col1': ['The first one is smal', 'Second is size medum', 'Third is coton'],
-        })
         recipe = """
         wrangles:
         - extract.custom:
@@ -1582,16 +1512,13 @@ class TestExtractCustom:
             use_spellcheck: True
             model_id: 829c1a73-1bfd-4ac0
         """
-        df = wrangles.recipe.run(recipe, dataframe=data)
+        df = wrangles.recipe.run(recipe, dataframe=self.df_misspelt.copy())
         assert df.iloc[0]['output'] == ['size: small'] and df.iloc[2]['output'] == ['cotton'] 
 
     def test_extract_custom_use_spellcheck_extract_raw(self):
         """
         Test extract.custom with use_spellcheck and extract_raw
         """
-        data = pd.DataFrame({
-            'col1': ['The first one is smal', 'Second is size medum', 'Third is coton'],
-        })
         recipe = """
         wrangles:
         - extract.custom:
@@ -1601,7 +1528,7 @@ class TestExtractCustom:
             extract_raw: True
             model_id: 829c1a73-1bfd-4ac0
         """
-        df = wrangles.recipe.run(recipe, dataframe=data)
+        df = wrangles.recipe.run(recipe, dataframe=self.df_misspelt.copy())
         assert df.iloc[0]['output'] == ['small'] and df.iloc[1]['output'] == ['medium'] 
 
     def test_extract_custom_ai_single_output(self):
@@ -2101,18 +2028,109 @@ class TestExtractCustom:
             assert label in result, f"Missing label '{label}' in output"  
             assert result[label] == [], f"Label '{label}' should be empty list"
 
+    def test_extract_custom_without_labels_skips_model_content(self):
+        """
+        Test that the model's training data is only
+        downloaded when it is needed to fill empty labels
+        """
+        with patch.dict("wrangles.data._model_cache", clear=True), patch(
+            "wrangles.data.model",
+            return_value={'purpose': 'extract', 'batch_size': None}
+        ), patch(
+            "wrangles.data.model_content"
+        ) as model_content, patch(
+            "wrangles.batching.batch_api_calls",
+            return_value=[['Charizard']]
+        ):
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.custom:
+                    input: col1
+                    output: out
+                    model_id: 1eddb7e8-1b2b-4a52
+                """,
+                dataframe=pd.DataFrame({'col1': ['Charizard']})
+            )
+        assert df['out'][0] == ['Charizard'] and not model_content.called
+
+    def test_extract_custom_multi_input_single_request(self):
+        """
+        Test that multiple columns using the same model
+        are sent to the API together
+        """
+        with patch.dict("wrangles.data._model_cache", clear=True), patch(
+            "wrangles.data.model",
+            return_value={'purpose': 'extract', 'batch_size': None}
+        ), patch(
+            "wrangles.batching.batch_api_calls",
+            side_effect=lambda url, params, input_list, batch_size: [[x] for x in input_list]
+        ) as batch_api_calls:
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.custom:
+                    input:
+                      - col1
+                      - col2
+                    output:
+                      - out1
+                      - out2
+                    model_id: 1eddb7e8-1b2b-4a52
+                """,
+                dataframe=pd.DataFrame({
+                    'col1': ['Charizard', 'Pikachu'],
+                    'col2': ['Jynx', 'Mew']
+                })
+            )
+        assert (
+            batch_api_calls.call_count == 1 and
+            df['out1'].tolist() == [['Charizard'], ['Pikachu']] and
+            df['out2'].tolist() == [['Jynx'], ['Mew']]
+        )
+
+    def test_extract_custom_multi_input_single_output_mocked(self):
+        """
+        Test that results from multiple columns are
+        combined into a single output without duplicates
+        """
+        with patch.dict("wrangles.data._model_cache", clear=True), patch(
+            "wrangles.data.model",
+            return_value={'purpose': 'extract', 'batch_size': None}
+        ), patch(
+            "wrangles.batching.batch_api_calls",
+            side_effect=lambda url, params, input_list, batch_size: [[x] if x != 'None' else [] for x in input_list]
+        ):
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.custom:
+                    input:
+                      - col1
+                      - col2
+                    output: out
+                    model_id: 1eddb7e8-1b2b-4a52
+                """,
+                dataframe=pd.DataFrame({
+                    'col1': ['Charizard', 'Pikachu', 'None'],
+                    'col2': ['Jynx', 'Pikachu', 'Mew']
+                })
+            )
+        assert df['out'].tolist() == [['Charizard', 'Jynx'], ['Pikachu'], ['Mew']]
+
 
 class TestExtractRegex:
     """
     Test extract.regex
     """
+    df = pd.DataFrame({
+        'col': ['Random Pikachu Random', 'Random', 'Random Random Pikachu']
+    })
+
     def test_extract_regex(self):
         """
         Extract Regex Extract
         """
-        data = pd.DataFrame({
-            'col': ['Random Pikachu Random', 'Random', 'Random Random Pikachu']
-        })
         recipe = """
         wrangles:
         - extract.regex:
@@ -2120,16 +2138,13 @@ class TestExtractRegex:
             output: col_out
             find: Pikachu
         """
-        df = wrangles.recipe.run(recipe, dataframe=data)
+        df = wrangles.recipe.run(recipe, dataframe=self.df.copy())
         assert df.iloc[0]['col_out'] == ['Pikachu']
 
     def test_extract_regex_no_match(self):
         """
         Test extract.regex with a pattern that does not return a match
         """
-        data = pd.DataFrame({
-            'col': ['Random Pikachu Random', 'Random', 'Random Random Pikachu']
-        })
         recipe = """
         wrangles:
         - extract.regex:
@@ -2137,7 +2152,7 @@ class TestExtractRegex:
             output: col_out
             find: \d+
         """
-        df = wrangles.recipe.run(recipe, dataframe=data)
+        df = wrangles.recipe.run(recipe, dataframe=self.df.copy())
         assert df.iloc[0]['col_out'] == []
 
     def test_extract_regex_no_match_first_element(self):
@@ -2145,9 +2160,6 @@ class TestExtractRegex:
         Test extract.regex with a pattern that does not return a match
         while using first_element
         """
-        data = pd.DataFrame({
-            'col': ['Random Pikachu Random', 'Random', 'Random Random Pikachu']
-        })
         recipe = """
         wrangles:
         - extract.regex:
@@ -2156,7 +2168,7 @@ class TestExtractRegex:
             find: \d+
             first_element: True
         """
-        df = wrangles.recipe.run(recipe, dataframe=data)
+        df = wrangles.recipe.run(recipe, dataframe=self.df.copy())
         assert df.iloc[0]['col_out'] == ''
 
     def test_extract_regex_no_match_first_element_output_pattern(self):
@@ -2164,9 +2176,6 @@ class TestExtractRegex:
         Test extract.regex with a pattern that does not return a match
         while using first_element and output_pattern
         """
-        data = pd.DataFrame({
-            'col': ['Random Pikachu Random', 'Random', 'Random Random Pikachu']
-        })
         recipe = r"""
         wrangles:
         - extract.regex:
@@ -2176,7 +2185,7 @@ class TestExtractRegex:
             first_element: True
             output_pattern: \1
         """
-        df = wrangles.recipe.run(recipe, dataframe=data)
+        df = wrangles.recipe.run(recipe, dataframe=self.df.copy())
         assert df.iloc[0]['col_out'] == ''
 
     def test_extract_regex_first_element(self):
@@ -2614,6 +2623,32 @@ class TestExtractProperties:
         assert df.empty and df.columns.to_list() == ['column', 'colour']
 
 
+    def test_extract_properties_skips_values_without_letters(self):
+        """
+        Test that values without any letters aren't sent to the API
+        """
+        with patch(
+            "wrangles.batching.batch_api_calls",
+            side_effect=lambda url, params, input_list, batch_size: [['Blue'] for _ in input_list]
+        ) as batch_api_calls:
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.properties:
+                    input: column
+                    output: colour
+                    property_type: colours
+                """,
+                dataframe=pd.DataFrame({
+                    "column": ['Blue sky', '1234', '', '12-3/4"']
+                })
+            )
+        assert (
+            batch_api_calls.call_args.args[2] == ['Blue sky'] and
+            df['colour'].tolist() == [['Blue'], [], [], []]
+        )
+
+
 class TestExtractHTML:
     """
     Test extract.html
@@ -2766,6 +2801,25 @@ class TestExtractBrackets:
         df = wrangles.recipe.run(recipe, dataframe=data)
         assert df.iloc[0]['output'] == '12345, 6789'
 
+    def test_extract_brackets_multi_input_arrow_strings(self):
+        """
+        Multiple Arrow backed string inputs to a single output
+        """
+        data = pd.DataFrame({
+            'col': pd.array(['[12345]', None], dtype='string[pyarrow]'),
+            'col2': pd.array(['[6789]', '(abc)'], dtype='string[pyarrow]'),
+        })
+        recipe = """
+        wrangles:
+        - extract.brackets:
+            input:
+                - col
+                - col2
+            output: output
+        """
+        df = wrangles.recipe.run(recipe, dataframe=data)
+        assert df['output'].tolist() == ['12345, 6789', 'NA, abc']
+
     def test_extract_brackets_multi_input_where(self):
         """
         Test extract.brackets with multiple inputs, and one output using where
@@ -2896,6 +2950,24 @@ class TestExtractBrackets:
         df = wrangles.recipe.run(recipe, dataframe=data)
         assert df['output'].tolist() == ['some', 'example', '', '']
 
+    def test_multi_bracket_every_type_listed(self):
+        data = pd.DataFrame({
+            'input': ['(some)', '[example]', '{example}', '<example>']
+        })
+        recipe = """
+        wrangles:
+            - extract.brackets:
+                input: input
+                output: output
+                find: 
+                    - angled
+                    - curly
+                    - square
+                    - round
+        """
+        df = wrangles.recipe.run(recipe, dataframe=data)
+        assert df['output'].tolist() == ['some', 'example', 'example', 'example']
+
     def test_all_brackets_no_find_raw(self):
         data = pd.DataFrame({
             'input': ['(some) and (some2)', '[example]', '{example}', '<example>']
@@ -3086,6 +3158,48 @@ class TestExtractDateProperties:
         df = wrangles.recipe.run(recipe, dataframe=data)
         assert df.iloc[0]['out1'] == ['Sunday','Monday']
 
+    def test_date_properties_multi_input_multi_row(self):
+        """
+        Multiple inputs to single output with more than one row
+        """
+        data = pd.DataFrame({
+            'col1': ['12/24/2000', '11/10/1987'],
+            'col2': ['4/24/2023', '1/9/2006']
+        })
+        recipe = """
+        wrangles:
+          - extract.date_properties:
+              input: 
+                - col1
+                - col2
+              output: out1
+              property: month
+        """
+        df = wrangles.recipe.run(recipe, dataframe=data)
+        assert df['out1'].tolist() == [[12, 4], [11, 1]]
+
+    def test_date_properties_repeated_input_in_place(self):
+        """
+        Repeating an input that is overwritten in place
+        uses the original dates for every output
+        """
+        data = pd.DataFrame({
+            'col1': ['12/24/2000', '11/10/1987']
+        })
+        recipe = """
+        wrangles:
+          - extract.date_properties:
+              input:
+                - col1
+                - col1
+              output:
+                - col1
+                - out2
+              property: month
+        """
+        df = wrangles.recipe.run(recipe, dataframe=data)
+        assert df['col1'].tolist() == [12, 11] and df['out2'].tolist() == [12, 11]
+
     def test_multi_input_multi_output(self):
         """
         Multiple inputs and outputs
@@ -3195,6 +3309,74 @@ class TestExtractDateRange:
             '"millennium" not a valid frequency' in info.value.args[0]
         )
 
+    def test_date_range_fixed_units(self):
+        """
+        Test extract.date_range with fixed length
+        frequencies, including an end before the start
+        """
+        data = pd.DataFrame({
+        'date1': ['2024-01-01 10:30', '2024-03-05 00:00', '2024-01-02 00:00'],
+        'date2': ['2024-01-03 10:29', '2024-03-05 05:59', '2024-01-01 00:00'],
+        })
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+            - extract.date_range:
+                start_time: date1
+                end_time: date2
+                output: Days
+                range: days
+            - extract.date_range:
+                start_time: date1
+                end_time: date2
+                output: Hours
+                range: hours
+            """,
+            dataframe=data
+        )
+        assert df['Days'].tolist() == [1, 0, 0] and df['Hours'].tolist() == [47, 5, 0]
+
+    def test_date_range_timezones(self):
+        """
+        Test extract.date_range with a timezone aware
+        column counts using the local times
+        """
+        data = pd.DataFrame({
+        'date1': pd.to_datetime(['2024-01-01 22:00', '2024-01-02 00:00']).tz_localize('US/Eastern'),
+        'date2': ['2024-01-02 01:00', '2024-01-02 03:30'],
+        })
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+            - extract.date_range:
+                start_time: date1
+                end_time: date2
+                output: Hours
+                range: hours
+            """,
+            dataframe=data
+        )
+        assert df['Hours'].tolist() == [3, 3]
+
+    def test_date_range_repeated_dates(self):
+        """
+        Test extract.date_range with repeated pairs of dates
+        """
+        data = pd.DataFrame({
+        'date1': ['08-13-1992', '11-10-1987', '08-13-1992'],
+        'date2': ['08-13-2022', '11-10-2024', '08-13-2022'],
+        })
+        recipe = """
+        wrangles:
+        - extract.date_range:
+            start_time: date1
+            end_time: date2
+            output: Range
+            range: years
+        """
+        df = wrangles.recipe.run(recipe, dataframe=data)
+        assert df['Range'].tolist() == [29, 36, 29]
+
     def test_date_range_where(self):
         """
         Test extract.date_range with where
@@ -3789,6 +3971,52 @@ class TestExtractAI:
             )
         assert "API Key" in error.value.args[0]
 
+    def test_ai_missing_apikey_no_request(self):
+        """
+        Test that a blank API key for OpenAI
+        raises an error without calling the API
+        """
+        with patch("wrangles.openai._session.post") as post:
+            with pytest.raises(ValueError, match="API Key"):
+                wrangles.recipe.run(
+                    """
+                    wrangles:
+                      - extract.ai:
+                          api_key: ''
+                          output: Any lengths found in the data
+                    """,
+                    dataframe=pd.DataFrame({
+                        "data": ["wrench 25mm"],
+                    })
+                )
+        assert post.call_count == 0
+
+    def test_ai_custom_url_empty_apikey(self):
+        """
+        Test that a custom endpoint accepts
+        an empty API key
+        """
+        with patch(
+            "wrangles.openai.chatGPT",
+            return_value={"length": "25mm"}
+        ) as chatGPT:
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                  - extract.ai:
+                      api_key: ''
+                      url: http://localhost:8000/v1/chat/completions
+                      output:
+                        length:
+                          type: string
+                          description: Any lengths found in the data
+                """,
+                dataframe=pd.DataFrame({
+                    "data": ["wrench 25mm"],
+                })
+            )
+        assert chatGPT.call_count == 1 and df['length'][0] == '25mm'
+
     def test_ai_where(self):
         """
         Test using where with extract.ai
@@ -4137,3 +4365,216 @@ class TestExtractAI:
             )
         assert list(df.columns) == ["Product", "Size (Diameter)", "Size"]
         assert df["Size (Diameter)"].tolist() == ['1-7/8"', '2-3/8"']
+
+    def test_ai_dedupe_identical_rows(self):
+        """
+        Test that identical rows are only sent to the model once
+        """
+        with patch(
+            "wrangles.openai.chatGPT",
+            side_effect=lambda data, *args: {"Colour": data["Product"].split()[0]}
+        ) as chatGPT:
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.ai:
+                    input: Product
+                    api_key: dummy
+                    output:
+                      Colour:
+                        type: string
+                        description: The colour of the product
+                """,
+                dataframe=pd.DataFrame({
+                    "Product": ['Red cap', 'Blue cap', 'Red cap'],
+                }),
+            )
+        assert chatGPT.call_count == 2
+        assert df["Colour"].tolist() == ['Red', 'Blue', 'Red']
+
+    def test_ai_missing_keys_filled(self):
+        """
+        Test that keys missing from some responses
+        are filled with empty strings on a custom index
+        """
+        with patch(
+            "wrangles.openai.chatGPT",
+            side_effect=lambda data, *args: (
+                {"Colour": "Red", "Size": "L"}
+                if data["Product"] == 'Red cap L'
+                else {"Colour": "Blue"}
+            )
+        ):
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.ai:
+                    input: Product
+                    api_key: dummy
+                    output:
+                      Colour:
+                        type: string
+                        description: The colour of the product
+                      Size:
+                        type: string
+                        description: The size of the product
+                """,
+                dataframe=pd.DataFrame(
+                    {"Product": ['Red cap L', 'Blue cap']},
+                    index=[5, 7]
+                ),
+            )
+        assert (
+            df["Colour"].tolist() == ['Red', 'Blue'] and
+            df["Size"].tolist() == ['L', ''] and
+            df.index.tolist() == [5, 7]
+        )
+
+    def test_ai_row_data(self):
+        """
+        Test that each row is sent to the model as
+        a dict of the input columns with native values
+        """
+        rows = []
+        def mock_chatgpt(data, *args):
+            rows.append(data)
+            return {"Colour": "Red"}
+
+        with patch("wrangles.openai.chatGPT", side_effect=mock_chatgpt):
+            wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.ai:
+                    input:
+                      - Product
+                      - Quantity
+                    api_key: dummy
+                    output:
+                      Colour:
+                        type: string
+                        description: The colour of the product
+                """,
+                dataframe=pd.DataFrame({
+                    "Product": ['Red cap', 'Blue cap'],
+                    "Quantity": [3, 4],
+                    "Other": ['a', 'b'],
+                }),
+            )
+        assert (
+            rows == [
+                {"Product": "Red cap", "Quantity": 3},
+                {"Product": "Blue cap", "Quantity": 4}
+            ] and
+            type(rows[0]["Quantity"]) == int
+        )
+
+    def test_ai_dedupe_disabled(self):
+        """
+        Test that every row is sent when dedupe is false
+        """
+        with patch(
+            "wrangles.openai.chatGPT",
+            side_effect=lambda data, *args: {"Colour": data["Product"].split()[0]}
+        ) as chatGPT:
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.ai:
+                    input: Product
+                    api_key: dummy
+                    dedupe: false
+                    output:
+                      Colour:
+                        type: string
+                        description: The colour of the product
+                """,
+                dataframe=pd.DataFrame({
+                    "Product": ['Red cap', 'Blue cap', 'Red cap'],
+                }),
+            )
+        assert chatGPT.call_count == 3
+        assert df["Colour"].tolist() == ['Red', 'Blue', 'Red']
+
+    def test_ai_batch_size(self):
+        """
+        Test that rows are sent to the model in batches
+        """
+        def mock_chatgpt(data, *args):
+            return {"results": [{"Colour": x["Product"].split()[0]} for x in data]}
+
+        with patch("wrangles.openai.chatGPT", side_effect=mock_chatgpt) as chatGPT:
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.ai:
+                    input: Product
+                    api_key: dummy
+                    batch_size: 2
+                    output:
+                      Colour:
+                        type: string
+                        description: The colour of the product
+                """,
+                dataframe=pd.DataFrame({
+                    "Product": ['Red cap', 'Blue cap', 'Green cap'],
+                }),
+            )
+        assert chatGPT.call_count == 2
+        assert df["Colour"].tolist() == ['Red', 'Blue', 'Green']
+
+    def test_ai_batch_size_mismatch(self):
+        """
+        Test that a batch is retried row by row if the
+        model doesn't return a result for every row
+        """
+        def mock_chatgpt(data, *args):
+            if isinstance(data, list):
+                return {"results": [{"Colour": "Red"}]}
+            return {"Colour": data["Product"].split()[0]}
+
+        with patch("wrangles.openai.chatGPT", side_effect=mock_chatgpt) as chatGPT:
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.ai:
+                    input: Product
+                    api_key: dummy
+                    batch_size: 5
+                    output:
+                      Colour:
+                        type: string
+                        description: The colour of the product
+                """,
+                dataframe=pd.DataFrame({
+                    "Product": ['Red cap', 'Blue cap'],
+                }),
+            )
+        assert chatGPT.call_count == 3
+        assert df["Colour"].tolist() == ['Red', 'Blue']
+
+    def test_ai_batch_api(self):
+        """
+        Test that batch_api submits all unique rows to the Batch API together
+        """
+        with patch(
+            "wrangles.openai.chatGPT_batch",
+            side_effect=lambda data, *args: [{"Colour": x["Product"].split()[0]} for x in data]
+        ) as chatGPT_batch:
+            df = wrangles.recipe.run(
+                """
+                wrangles:
+                - extract.ai:
+                    input: Product
+                    api_key: dummy
+                    batch_api: true
+                    output:
+                      Colour:
+                        type: string
+                        description: The colour of the product
+                """,
+                dataframe=pd.DataFrame({
+                    "Product": ['Red cap', 'Blue cap', 'Red cap'],
+                }),
+            )
+        assert chatGPT_batch.call_count == 1 and len(chatGPT_batch.call_args.args[0]) == 2
+        assert df["Colour"].tolist() == ['Red', 'Blue', 'Red']
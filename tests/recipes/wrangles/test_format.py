@@ -230,6 +230,24 @@ class TestFormatTrim:
             'The lists for input and output must be the same length.' in info.value.args[0]
         )
     
+    def test_trim_arrow_strings(self):
+        """
+        Test trim on an arrow backed string column
+        """
+        data = pd.DataFrame({
+            'col': pd.Series(['  Hello  ', ' World', None], dtype='string[pyarrow]')
+        })
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+            - format.trim:
+                input: col
+                output: out
+            """,
+            dataframe=data
+        )
+        assert df['out'].tolist() == ['Hello', 'World', '']
+
     def test_trim_invalid_data(self):
         """
         Test that trim fails gracefully with invalid data
@@ -767,6 +785,25 @@ class TestFormatDates:
         df = wrangles.recipe.run(recipe, dataframe=data)
         assert df.iloc[0]['date'] == '1992-08-13' and df.iloc[1]['date'] == '11/10/1987'
 
+    def test_date_format_repeated_values(self):
+        """
+        Test format.dates with repeated and missing values
+        """
+        data = pd.DataFrame({
+            'col': ['8/13/1992', '11/10/1987', None, '8/13/1992']
+        }, index=[3, 1, 4, 2])
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+            - format.dates:
+                input: col
+                output: out
+                format: "%Y-%m-%d"
+            """,
+            dataframe=data
+        )
+        assert df['out'].tolist() == ['1992-08-13', '1987-11-10', '', '1992-08-13']
+
     def test_date_format_empty_dataframe(self):
         """
         Test date_format with an empty dataframe
@@ -1278,3 +1315,61 @@ class TestFormatSignificantFigures:
         """
         df = wrangles.recipe.run(recipe, dataframe=data)
         assert df.empty and df.columns.to_list() == ['col1', 'out1']
+
+
+class TestFormatPriceBreaks:
+    """
+    Test format.price_breaks wrangle
+    """
+    def test_price_breaks_non_default_index(self):
+        """
+        Test that the output lines up with the rows
+        when the dataframe has a non-default index
+        """
+        data = pd.DataFrame(
+            {
+                '1': [10, 20],
+                '10': [9, ''],
+            },
+            index=[5, 3]
+        )
+        recipe = """
+        wrangles:
+            - format.price_breaks:
+                input:
+                  - '1'
+                  - '10'
+                categoryLabel: Qty
+                valueLabel: Price
+        """
+        df = wrangles.recipe.run(recipe, dataframe=data)
+        assert (
+            df.index.to_list() == [5, 3] and
+            df['Qty 1'].to_list() == ['1', '1'] and
+            df['Price 1'].to_list() == [10, 20] and
+            df['Qty 2'].to_list() == ['10', ''] and
+            df['Price 2'].to_list() == [9, '']
+        )
+
+    def test_price_breaks_overwrite_existing_column(self):
+        """
+        Test that an output column that already exists
+        is overwritten rather than duplicated
+        """
+        data = pd.DataFrame({
+            '1': [10, 20],
+            'Price 1': ['old', 'old'],
+        })
+        recipe = """
+        wrangles:
+            - format.price_breaks:
+                input:
+                  - '1'
+                categoryLabel: Qty
+                valueLabel: Price
+        """
+        df = wrangles.recipe.run(recipe, dataframe=data)
+        assert (
+            df.columns.to_list() == ['1', 'Price 1', 'Qty 1'] and
+            df['Price 1'].to_list() == [10, 20]
+        )
@@ -905,6 +905,76 @@ class TestSplitDictionary:
             df['Col4'][0] == 'D'
         )
 
+    def test_split_dictionary_multi_input_default(self):
+        """
+        Test splitting dictionaries from multiple columns
+        with default values and later columns taking priority
+        """
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+            - split.dictionary:
+                input:
+                  - col1
+                  - col2
+                default:
+                    Col2: X
+                    Col4: D
+            """,
+            dataframe=pd.DataFrame({
+                'col1': [{'Col1': 'A', 'Col2': 'B'}, '{"Col1": "E"}'],
+                'col2': ['{"Col2": "C"}', {'Col4': 'F'}]
+            })
+        )
+        assert (
+            df['Col1'].tolist() == ['A', 'E'] and
+            df['Col2'].tolist() == ['C', 'X'] and
+            df['Col4'].tolist() == ['D', 'F']
+        )
+
+    def test_split_dictionary_custom_index(self):
+        """
+        Test splitting dictionaries with mixed value
+        types on a dataframe with a non-default index
+        """
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+            - split.dictionary:
+                input: col1
+            """,
+            dataframe=pd.DataFrame(
+                {'col1': [{'Col1': 1, 'Col2': 'A'}, {'Col1': 2, 'Col2': 'B'}]},
+                index=[7, 3]
+            )
+        )
+        assert (
+            df['Col1'].tolist() == [1, 2] and
+            df['Col2'].tolist() == ['A', 'B'] and
+            df.index.tolist() == [7, 3]
+        )
+
+    def test_split_dictionary_int_and_float(self):
+        """
+        Test that dictionaries with int and float values
+        produce float columns rather than objects
+        """
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+            - split.dictionary:
+                input: col1
+            """,
+            dataframe=pd.DataFrame({
+                'col1': [{'Col1': 1, 'Col2': 2.5}, {'Col1': 3, 'Col2': 4.5}]
+            })
+        )
+        assert (
+            df['Col1'].dtype == 'float64' and
+            df['Col1'].tolist() == [1.0, 3.0] and
+            df['Col2'].tolist() == [2.5, 4.5]
+        )
+
     def test_split_dictionary_multiple(self):
         """
         Test splitting a list of dictionaries
@@ -0,0 +1,35 @@
+"""
+Test batching of API calls
+"""
+from wrangles.batching import batch_unique_api_calls
+
+
+def test_batch_unique_api_calls(mocker):
+    """
+    Check duplicate values are only sent once
+    and the results are expanded back to the input
+    """
+    m = mocker.patch(
+        "wrangles.batching.batch_api_calls",
+        side_effect=lambda url, params, input_list, batch_size: [[x.upper()] for x in input_list]
+    )
+    results = batch_unique_api_calls('url', {}, ['a', 'b', 'a', 'a'], 10)
+    assert m.call_args[0][2] == ['a', 'b']
+    assert results == [['A'], ['B'], ['A'], ['A']]
+    assert results[0] is not results[2]
+
+
+def test_batch_unique_api_calls_tabular(mocker):
+    """
+    Check deduplicated results are expanded
+    for responses with data and columns
+    """
+    mocker.patch(
+        "wrangles.batching.batch_api_calls",
+        side_effect=lambda url, params, input_list, batch_size: {
+            "columns": ["value"],
+            "data": [[x.upper()] for x in input_list]
+        }
+    )
+    results = batch_unique_api_calls('url', {}, ['a', 'a', 'b'], 10)
+    assert results == {"columns": ["value"], "data": [['A'], ['A'], ['B']]}
@@ -0,0 +1,19 @@
+"""
+Test model data lookups
+"""
+import wrangles
+
+
+def test_model_metadata_cached(mocker):
+    """
+    Check model metadata is only requested
+    once when used repeatedly
+    """
+    mocker.patch.dict("wrangles.data._model_cache", clear=True)
+    m = mocker.patch(
+        "wrangles.data.model",
+        return_value={'purpose': 'extract', 'batch_size': None}
+    )
+    wrangles.data._model_cached('aaaaaaaa-bbbb-cccc')
+    metadata = wrangles.data._model_cached('aaaaaaaa-bbbb-cccc')
+    assert m.call_count == 1 and metadata['purpose'] == 'extract'
@@ -0,0 +1,108 @@
+"""
+Test requests to OpenAI with the API mocked
+"""
+import json
+import requests
+import wrangles
+
+
+def test_chatgpt_does_not_modify_settings(mocker):
+    """
+    Check the shared settings aren't modified
+    when a row is added to the messages
+    """
+    response = mocker.Mock(ok=True)
+    response.json.return_value = {
+        'choices': [{'message': {'tool_calls': [{'function': {'arguments': '{"output": "Red"}'}}]}}]
+    }
+    post = mocker.patch("wrangles.openai._session.post", return_value=response)
+    settings = {"model": "gpt-4.1-mini", "messages": [{"role": "system", "content": "Extract"}]}
+    result = wrangles.openai.chatGPT("Red cap", "key", settings)
+    assert result == {"output": "Red"}
+    assert len(settings["messages"]) == 1
+    assert post.call_args.kwargs["json"]["messages"][-1]["content"].endswith("Red cap")
+
+
+def test_chatgpt_batch(mocker):
+    """
+    Check rows are submitted as a batch file and
+    the results are returned in the original order
+    """
+    def response(body=None, text=''):
+        r = mocker.Mock(ok=True, text=text)
+        r.json.return_value = body
+        return r
+
+    def output_line(i, value):
+        return json.dumps({
+            "custom_id": str(i),
+            "response": {"body": {"choices": [{"message": {"tool_calls": [
+                {"function": {"arguments": json.dumps({"output": value})}}
+            ]}}]}}
+        })
+
+    post = mocker.patch("wrangles.openai._session.post", side_effect=[
+        response({"id": "file-in"}),
+        response({"id": "batch-1", "status": "in_progress"})
+    ])
+    mocker.patch("wrangles.openai._session.get", side_effect=[
+        response({"id": "batch-1", "status": "completed", "output_file_id": "file-out"}),
+        response(text="\n".join([output_line(1, "Blue"), output_line(0, "Red")]))
+    ])
+    mocker.patch("wrangles.openai._time.sleep")
+
+    settings = {
+        "model": "gpt-4.1-mini",
+        "messages": [],
+        "tools": [{"function": {"parameters": {"required": ["output"]}}}]
+    }
+    results = wrangles.openai.chatGPT_batch(["Red cap", "Blue cap", "Green cap"], "key", settings)
+
+    assert post.call_args_list[0].args[0] == "https://api.openai.com/v1/files"
+    assert post.call_args_list[1].kwargs["json"]["endpoint"] == "/v1/chat/completions"
+    assert results == [{"output": "Red"}, {"output": "Blue"}, {"output": "Failed"}]
+
+
+def test_chatgpt_cache(mocker):
+    """
+    Check identical requests are only sent
+    once when the cache is enabled
+    """
+    mocker.patch.dict("wrangles.openai._response_cache", clear=True)
+    response = mocker.Mock(ok=True)
+    response.json.return_value = {
+        'choices': [{'message': {'tool_calls': [{'function': {'arguments': '{"output": "Red"}'}}]}}]
+    }
+    post = mocker.patch("wrangles.openai._session.post", return_value=response)
+    settings = {"model": "gpt-4.1-mini", "messages": []}
+
+    first = wrangles.openai.chatGPT("Red cap", "key", settings, cache=True)
+    first["output"] = "Changed"
+    second = wrangles.openai.chatGPT("Red cap", "key", settings, cache=True)
+    wrangles.openai.chatGPT("Red cap", "key", settings)
+    assert second == {"output": "Red"}
+    assert post.call_count == 2
+
+
+def test_chatgpt_retry_timeouts(mocker):
+    """
+    Check retries are given longer timeouts
+    and the backoff includes jitter
+    """
+    response = mocker.Mock(ok=True)
+    response.json.return_value = {
+        'choices': [{'message': {'tool_calls': [{'function': {'arguments': '{"output": "Red"}'}}]}}]
+    }
+    post = mocker.patch("wrangles.openai._session.post", side_effect=[
+        requests.exceptions.ReadTimeout(),
+        requests.exceptions.ReadTimeout(),
+        requests.exceptions.ReadTimeout(),
+        response
+    ])
+    sleep = mocker.patch("wrangles.openai._time.sleep")
+    settings = {"model": "gpt-4.1-mini", "messages": []}
+
+    result = wrangles.openai.chatGPT("Red cap", "key", settings, timeout=5, retries=3)
+    assert result == {"output": "Red"}
+    assert [c.kwargs["timeout"] for c in post.call_args_list] == [5, 10, 20, 20]
+    assert all(0 <= c.args[0] <= 2 ** i for i, c in enumerate(sleep.call_args_list))
@@ -3,6 +3,7 @@ Code to batch API calls for large volumes of data that
 are unable to be processed in a single request
 """
 
+import copy as _copy
 import logging as _logging
 from . import auth as _auth
 from . import utils as _utils
@@ -59,3 +60,45 @@ def batch_api_calls(url, params, input_list, batch_size):
             raise ValueError(f"API Response did not return an expected format.")
 
     return results
+
+
+def batch_unique_api_calls(url, params, input_list, batch_size):
+    """
+    Batch API calls, only sending each distinct value once.
+    Results are expanded back to match the original input.
+
+    Only suitable for endpoints where the result for
+    each input depends only on that input.
+    """
+    try:
+        unique_values = list(dict.fromkeys(input_list))
+    except TypeError:
+        # Unhashable values, send everything as is
+        return batch_api_calls(url, params, input_list, batch_size)
+
+    if len(unique_values) == len(input_list):
+        return batch_api_calls(url, params, input_list, batch_size)
+
+    _logging.debug(f": Deduplicated {len(input_list)} records to {len(unique_values)} unique values")
+    results = batch_api_calls(url, params, unique_values, batch_size)
+
+    def _expand(unique_results):
+        lookup = dict(zip(unique_values, unique_results))
+
+        # Copy repeated results so rows don't share mutable objects
+        seen = set()
+        expanded = []
+        for value in input_list:
+            if value in seen:
+                expanded.append(_copy.deepcopy(lookup[value]))
+            else:
+                seen.add(value)
+                expanded.append(lookup[value])
+        return expanded
+
+    if isinstance(results, dict):
+        # Tabular response, expand the rows
+        results["data"] = _expand(results["data"])
+        return results
+
+    return _expand(results)
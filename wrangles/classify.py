@@ -42,7 +42,7 @@ def classify(
        
     url = f'{_config.api_host}/wrangles/classify'
     params = {'responseFormat': 'array', 'model_id': model_id, **kwargs}
-    model_properties = _data.model(model_id)
+    model_properties = _data._model_cached(model_id)
     # If model_id format is correct but no mode_id exists
     if model_properties.get('message', None) == 'error': raise ValueError('Incorrect model_id.\nmodel_id may be wrong or does not exists')
     batch_size = model_properties['batch_size'] or 5000
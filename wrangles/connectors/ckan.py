@@ -1,16 +1,63 @@
 import logging as _logging
+import concurrent.futures as _futures
+import json as _json
+import os as _os
+import time as _time
 from io import BytesIO as _BytesIO
 from typing import Union as _Union
 import pandas as _pd
 import requests as _requests
+from urllib3.util import Retry as _Retry
 from . import file as _file
 
 
 _schema = {}
 
+# Maximum number of files to transfer concurrently
+_max_workers = 8
+
+# Number of pooled connections kept open per host
+# Can be overridden with the CKAN_POOL_SIZE environment variable
+_pool_size = int(_os.environ.get('CKAN_POOL_SIZE', 32))
+
+# Shared session so repeated calls to the same host
+# reuse pooled keep-alive connections
+_session = _requests.Session()
+_adapter = _requests.adapters.HTTPAdapter(
+    pool_connections=_pool_size,
+    pool_maxsize=_pool_size,
+    max_retries=_Retry(total=3, backoff_factor=0.2)
+)
+_session.mount('https://', _adapter)
+_session.mount('http://', _adapter)
+
+
+# Dataset metadata is looked up for every read and write.
+# Cache it briefly so repeated calls within a recipe
+# only request it once without serving stale metadata later.
+_packages_cache = {}
+_packages_cache_ttl = 60
+
+
+def _clear_packages_cache():
+    """
+    Clear the cached dataset metadata
+    """
+    _packages_cache.clear()
+
 
 def _get_packages_in_dataset(host, dataset, api_key):
-    response = _requests.get(
+    """
+    Get the resources of a dataset keyed by name,
+    reusing a recent result if available.
+    The returned dict is shared and must not be modified.
+    """
+    key = (host, dataset, api_key)
+    cached = _packages_cache.get(key)
+    if cached and _time.monotonic() - cached[0] < _packages_cache_ttl:
+        return cached[1]
+
+    response = _session.get(
         url = f"{host}/api/3/action/package_show?id={dataset}",
         headers={'Authorization': api_key}
     )
@@ -24,33 +71,91 @@ def _get_packages_in_dataset(host, dataset, api_key):
     results = {}
     for resource in response.json()["result"]["resources"]:
         results[resource["name"]] = resource
-    
+
+    _packages_cache[key] = (_time.monotonic(), results)
     return results
 
 
-def read(host: str, dataset: str, file: str, api_key: str = None, **kwargs) -> _pd.DataFrame:
+def _get_packages_with_files(host, dataset, api_key, files):
+    """
+    Get the resources of a dataset, refreshing the cached
+    metadata if any of the requested files are not present
+    """
+    packages = _get_packages_in_dataset(host, dataset, api_key)
+    if not all(fname in packages for fname in files):
+        _clear_packages_cache()
+        packages = _get_packages_in_dataset(host, dataset, api_key)
+    return packages
+
+
+def _revise_resources(host, dataset, api_key, packages, uploads):
+    """
+    Create or update several resources in a single request
+    using the CKAN package_revise action.
+
+    :param uploads: List of (output name, file contents) tuples
+    :return: True if the server accepted the revision, False if it \
+        is not supported and the files should be uploaded individually
+    """
+    new_names = [name for name, _ in uploads if name not in packages]
+
+    data = {"match__name": dataset}
+    if new_names:
+        data["update__resources__extend"] = _json.dumps([{"name": name} for name in new_names])
+
+    files = {}
+    for name, content in uploads:
+        if name in packages:
+            # Existing resources are referenced by id
+            key = f"update__resources__{packages[name]['id']}__upload"
+        else:
+            # New resources are appended, so reference by position from the end
+            key = f"update__resources__{new_names.index(name) - len(new_names)}__upload"
+        files[key] = (name, content)
+
+    response = _session.post(
+        url = f"{host}/api/action/package_revise",
+        data = data,
+        headers = {"Authorization": api_key},
+        files = files
+    )
+
+    if response.status_code == 403:
+        raise RuntimeError("Access Denied to the CKAN Server. Check your API_KEY.")
+
+    return response.status_code == 200
+
+
+def read(host: str, dataset: str, file: _Union[str, list], api_key: str = None, **kwargs) -> _Union[_pd.DataFrame, list]:
     """
     Read data from CKAN
     
     :param host: The host name of the CKAN site. e.g. https://data.example.com
     :param dataset: The name of the dataset. This should be the url version e.g. my-dataset
-    :param file: The name of the specific file within the dataset.
+    :param file: The name of the specific file within the dataset. If a list is given, the files are downloaded concurrently and a list of dataframes is returned.
     :param api_key: API Key for the CKAN site.
     :param kwargs: (Optional) Named arguments to pass to respective pandas read a file function.
     """
     _logging.info(f": Reading data from CKAN :: {host} / {dataset} / {file}")
     
-    packages = _get_packages_in_dataset(host, dataset, api_key)
+    files = file if isinstance(file, list) else [file]
+    packages = _get_packages_with_files(host, dataset, api_key, files)
 
-    if file not in packages.keys():
-        raise ValueError('File not found in dataset')
-    
-    # Download the requested data
-    response = _requests.get(packages[file]["url"], headers={'Authorization': api_key})
-    file_io = _BytesIO(response.content)
-    df = _file.read(file, file_object=file_io, **kwargs)    
- 
-    return df
+    for fname in files:
+        if fname not in packages.keys():
+            raise ValueError('File not found in dataset')
+
+    def _read_file(fname):
+        # Download the requested data
+        response = _session.get(packages[fname]["url"], headers={'Authorization': api_key})
+        file_io = _BytesIO(response.content)
+        return _file.read(fname, file_object=file_io, **kwargs)
+
+    if not isinstance(file, list):
+        return _read_file(file)
+
+    with _futures.ThreadPoolExecutor(max_workers=_max_workers) as executor:
+        return list(executor.map(_read_file, files))
     
 _schema['read'] = """
 type: object
@@ -67,8 +172,12 @@ properties:
     type: string
     description: The name of the dataset. This should be the url version e.g. my-dataset
   file:
-    type: string
-    description: The name of the specific file within the dataset. e.g. example.csv
+    type:
+      - string
+      - array
+    description: |
+      The name of the specific file within the dataset. e.g. example.csv
+      If a list of files is given, they are read concurrently.
   api_key:
     type: string
     description: API Key for the CKAN site.
@@ -87,20 +196,23 @@ def write(df: _pd.DataFrame, host: str, dataset: str, file: str, api_key: str, *
     """
     _logging.info(f": Writing data to CKAN :: {host} / {dataset} / {file}")
 
+    if not api_key:
+        raise RuntimeError("Access Denied to the CKAN Server. An API_KEY is required to write data.")
+
     memory_file = _BytesIO()
     _file.write(df, name=file, file_object=memory_file, **kwargs)    
 
     packages = _get_packages_in_dataset(host, dataset, api_key)
 
     if file in packages.keys():
-        response = _requests.post(
+        response = _session.post(
             url = f"{host}/api/action/resource_update",
             data = {"id": packages[file]["id"]},
             headers = {"Authorization": api_key},
             files = {'upload': (file, memory_file.getvalue())}
         )
     else:
-        response = _requests.post(
+        response = _session.post(
             url = f"{host}/api/action/resource_create",
             data={
                 "package_id": dataset,
@@ -110,6 +222,9 @@ def write(df: _pd.DataFrame, host: str, dataset: str, file: str, api_key: str, *
             files={'upload': (file, memory_file.getvalue())}
         )
 
+    # Dataset resources have changed, so cached metadata is stale
+    _clear_packages_cache()
+
     if response.status_code == 403:
         raise RuntimeError("Access Denied to the CKAN Server. Check your API_KEY.")
     elif response.status_code != 200:
@@ -198,17 +313,23 @@ class download:
         if not isinstance(file, list): file = [file]
         if not isinstance(output_file, list): output_file = [output_file]
         
-        packages = _get_packages_in_dataset(host, dataset, api_key)
+        packages = _get_packages_with_files(host, dataset, api_key, file)
         
-        for fname, output_fname in zip(file, output_file):
+        for fname in file:
             if fname not in packages.keys():
                 raise ValueError(f'File {fname} not found in dataset')
-            
-            # Download the requested data
-            response = _requests.get(packages[fname]["url"], headers={'Authorization': api_key})
 
-            with open(output_fname, "wb") as f:
-                f.write(_BytesIO(response.content).getbuffer())
+        def _download_file(fname, output_fname):
+            # Stream the requested data straight to disk
+            with _session.get(packages[fname]["url"], headers={'Authorization': api_key}, stream=True) as response:
+                # Don't save an error page as the file
+                response.raise_for_status()
+                with open(output_fname, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        f.write(chunk)
+
+        with _futures.ThreadPoolExecutor(max_workers=_max_workers) as executor:
+            list(executor.map(_download_file, file, output_file))
 
 
 class upload:
@@ -267,36 +388,60 @@ class upload:
         """
         _logging.info(f": Uploading data to CKAN :: {host} / {dataset} / {file}")
 
-        packages = _get_packages_in_dataset(host, dataset, api_key)
+        if not api_key:
+            raise RuntimeError("Access Denied to the CKAN Server. An API_KEY is required to upload files.")
 
         if not output_file: output_file = file
 
         if not isinstance(file, list): file = [file]
         if not isinstance(output_file, list): output_file = [output_file]
 
-        for fname, output_fname in zip(file, output_file):
+        def _read_file(fname):
             with open(fname, "rb") as f:
-                memory_file = _BytesIO(f.read())
+                return f.read()
+
+        # Fetch the dataset metadata while the local files are read
+        with _futures.ThreadPoolExecutor(max_workers=_max_workers) as executor:
+            packages_future = executor.submit(_get_packages_in_dataset, host, dataset, api_key)
+            contents = list(executor.map(_read_file, file))
+            packages = packages_future.result()
 
+        def _upload_file(fname, output_fname, content):
             if output_fname in packages.keys():
-                response = _requests.post(
+                response = _session.post(
                     url = f"{host}/api/action/resource_update",
                     data = {"id": packages[output_fname]["id"]},
                     headers = {"Authorization": api_key},
-                    files = {'upload': (output_fname, memory_file.getvalue())}
+                    files = {'upload': (output_fname, content)}
                 )
             else:
-                response = _requests.post(
+                response = _session.post(
                     url = f"{host}/api/action/resource_create",
                     data={
                         "package_id": dataset,
                         "name": output_fname
                     },
                     headers={"Authorization": api_key},
-                    files={'upload': (output_fname, memory_file.getvalue())}
+                    files={'upload': (output_fname, content)}
                 )
 
             if response.status_code == 403:
                 raise RuntimeError("Access Denied to the CKAN Server. Check your API_KEY.")
             elif response.status_code != 200:
                 raise RuntimeError(f"Upload to CKAN Failed - {fname}")
+
+        try:
+            # Upload all files in one request where the server supports it
+            if len(file) > 1 and len(set(output_file)) == len(file):
+                uploads = list(zip(output_file, contents))
+
+                if _revise_resources(host, dataset, api_key, packages, uploads):
+                    return
+
+                _logging.info(": CKAN package_revise unavailable, uploading files individually")
+
+            with _futures.ThreadPoolExecutor(max_workers=_max_workers) as executor:
+                list(executor.map(_upload_file, file, output_file, contents))
+        finally:
+            # Dataset resources have changed, so cached metadata is stale
+            _clear_packages_cache()
@@ -2,6 +2,7 @@
 Generate test data with fixed or randomly generated values
 """
 import pandas as _pd
+import numpy as _np
 import logging as _logging
 from lorem.text import TextLorem as _TextLorem
 import random as _random
@@ -9,6 +10,7 @@ import string as _string
 from typing import Union as _Union
 import re as _re
 import json as _json
+from ..utils import wildcard_expansion as _wildcard_expansion
 
 
 _lorem = _TextLorem()
@@ -16,14 +18,30 @@ _lorem = _TextLorem()
 
 _schema = {}
 
-def _random_date(start, end):
+# Characters used to generate random codes and chars
+_code_alphabet = _np.frombuffer((_string.ascii_uppercase + _string.digits).encode(), dtype='S1')
+_char_alphabet = _np.array(list(_string.ascii_lowercase), dtype=object)
+
+
+def _random_dates(start, end, rows: int, rng: _np.random.Generator) -> list:
     """
     Generate random dates given a date range
     """
     start_value = start.value//10**9
     end_value = end.value//10**9
-    
-    return _pd.to_datetime(_random.randint(start_value, end_value), unit='s')
+
+    seconds = rng.integers(start_value, end_value, size=rows, endpoint=True)
+    return _pd.to_datetime(seconds, unit='s').tolist()
+
+def _random_codes(length: int, rows: int, rng: _np.random.Generator) -> list:
+    """
+    Generate random alphanumeric codes of a set length
+    """
+    if length == 0:
+        return [''] * rows
+
+    chars = _code_alphabet[rng.integers(0, len(_code_alphabet), size=(rows, length))]
+    return chars.view(f'S{length}').ravel().astype(str).tolist()
 
 def _generate_cell_values(data_type: _Union[str, list], rows: int):
     """
@@ -33,9 +51,13 @@ def _generate_cell_values(data_type: _Union[str, list], rows: int):
     :param data_type: String or code to create random data
     :param rows: Number of rows to create
     """
+    # Seed from the random module so random.seed() still
+    # gives reproducible data
+    rng = _np.random.default_rng(_random.getrandbits(64))
+
     if isinstance(data_type, str):
         if data_type == '<char>':
-            return [_random.choice(_string.ascii_lowercase) for _ in range(rows)]
+            return _char_alphabet[rng.integers(0, len(_char_alphabet), size=rows)].tolist()
 
         elif data_type == '<word>':
             return [_lorem._word() for _ in range(rows)]
@@ -44,16 +66,16 @@ def _generate_cell_values(data_type: _Union[str, list], rows: int):
             return [_lorem.sentence()[:-1] for _ in range(rows)]
 
         elif data_type == '<boolean>':
-            return [bool(_random.getrandbits(1)) for _ in range(rows)]
+            return rng.integers(0, 2, size=rows).astype(bool).tolist()
         
         elif '<random([' in data_type:
             try:
                 # return a random value from a list of values
                 random_list = _json.loads(_re.search(r'<random\((.+)\)>', data_type).group(1))
-                return [random_list[_random.randint(0, len(random_list) - 1)] for _ in range(rows)]
+                return [random_list[i] for i in rng.integers(0, len(random_list), size=rows)]
             except:
                 # return the string as is if it can't be parsed
-                return [data_type for _ in range(rows)]
+                return [data_type] * rows
 
         elif _re.match(r'^\<int(\(\d+-\d+\))?\>$', data_type):
             # Match <int(1-10)> -> where (1-10) sets the range
@@ -62,7 +84,7 @@ def _generate_cell_values(data_type: _Union[str, list], rows: int):
                 int_range = [int(val) for val in int_range]
             except:
                 int_range = [1, 100]
-            return [_random.randint(int_range[0], int_range[1]) for _ in range(rows)]
+            return rng.integers(int_range[0], int_range[1], size=rows, endpoint=True).tolist()
 
         elif _re.match(r'^\<number(\(\d+(\.\d+)?-\d+(\.\d+)?\))?\>$', data_type):
             # Match <number(2.718-3.141)> -> where (2.718-3.141) sets the range and number of decimal places
@@ -75,7 +97,10 @@ def _generate_cell_values(data_type: _Union[str, list], rows: int):
             except: # pragma: no cover
                 num_range = [0, 1]
                 num_decimals = 2
-            return [round(_random.uniform(float(num_range[0]), float(num_range[1])), num_decimals) for _ in range(rows)]
+            return _np.round(
+                rng.uniform(float(num_range[0]), float(num_range[1]), size=rows),
+                num_decimals
+            ).tolist()
 
         elif _re.match(r'^\<code(\(\d+\))?\>$', data_type):
             # Match <code> or <code(8)> -> where (8) sets the length, default 8
@@ -83,10 +108,10 @@ def _generate_cell_values(data_type: _Union[str, list], rows: int):
                 length = int(_re.findall(r'\((\d+)\)', data_type)[0])
             except:
                 length = 8
-            return [''.join(_random.choice(_string.ascii_uppercase + _string.digits) for _ in range(length)) for _ in range(rows)]
+            return _random_codes(length, rows, rng)
         
         elif data_type == '<date>':
-            return [_pd.to_datetime('today').normalize() for _ in range(rows)]
+            return [_pd.to_datetime('today').normalize()] * rows
         
         # Get a random date from a range of dates
         elif '<date(' in data_type:
@@ -95,19 +120,25 @@ def _generate_cell_values(data_type: _Union[str, list], rows: int):
                 date_range_string = _re.findall(r'\d+-\d+-\d+\sto\s\d+-\d+-\d+', data_type)[0] 
                 start_date = _pd.to_datetime(date_range_string.split(' to ')[0])
                 end_date = _pd.to_datetime(date_range_string.split(' to ')[1])
-                return [_random_date(start_date, end_date) for _ in range(rows)]
+                return _random_dates(start_date, end_date, rows, rng)
             else:
                 # get the single date from the string =  <date(2020-01-01)> -> 2020-01-01
                 date = _pd.to_datetime(_re.findall(r'\d+-\d+-\d+', data_type)[0])
-                return [date for _ in range(rows)]
+                return [date] * rows
         
         else:
-            return [data_type for _ in range(rows)]
+            return [data_type] * rows
     else:
-        return [data_type for _ in range(rows)]
+        return [data_type] * rows
 
 
-def read(rows: int, values: dict = None) -> _pd.DataFrame:
+def read(
+    rows: int,
+    values: dict = None,
+    columns: _Union[str, list] = None,
+    where: str = None,
+    order_by: str = None
+) -> _pd.DataFrame:
     """
     Create a test dataframe
 
@@ -126,14 +157,25 @@ def read(rows: int, values: dict = None) -> _pd.DataFrame:
 
     :param rows: Number of rows to include in the created dataframe
     :param values: Dictionary of header and values
+    :param columns: (Optional) Subset of the columns to generate. If not provided, all columns will be included
+    :param where: (Optional) SQL where criteria the recipe will filter the data with. If provided, all columns are generated so it can reference them
+    :param order_by: (Optional) SQL order by criteria the recipe will sort the data with. If provided, all columns are generated so it can reference them
     :return: Pandas Dataframe of the created data
     """
     _logging.info(f": Generating test data :: {rows} row{'s' if rows > 1 else ''}")
     if values is None:
         values = {}
+
+    # Only generate the columns that will be kept.
+    # where and order_by are applied first and may
+    # reference other columns so need everything.
+    headers = list(values.keys())
+    if columns and not (where or order_by):
+        headers = _wildcard_expansion(headers, columns)
+
     data = {}
-    for key, val in values.items():
-        data[key] = _generate_cell_values(val, rows)
+    for key in headers:
+        data[key] = _generate_cell_values(values[key], rows)
 
     df = _pd.DataFrame(data)
     return df
@@ -5,6 +5,19 @@ from .. import data as _data
 from ..utils import wildcard_expansion as _wildcard_expansion
 from ..data import model as _model
 
+
+def _rows(df: _pd.DataFrame, columns: list) -> list:
+    """
+    Get the values of the columns as a list of rows.
+    Equivalent to df[columns].values.tolist() without
+    copying into an intermediate 2D object array.
+
+    :param df: Dataframe to get the rows from
+    :param columns: Columns to include in each row
+    """
+    return list(map(list, zip(*(df[column].tolist() for column in columns))))
+
+
 class classify():
     _schema = {}
 
@@ -56,15 +69,25 @@ class classify():
         _logging.info(": Training Classify Wrangle")
 
         # Select only specific columns if user requests them
+        # Only the names are needed, so avoid copying the data into a new dataframe
         if columns is not None:
             columns = _wildcard_expansion(df.columns, columns)
-            df = df[columns]
+        else:
+            columns = df.columns.to_list()
 
         required_columns = ['Example', 'Category', 'Notes']
-        if not required_columns == list(df.columns[:3]):
+        if not required_columns == list(columns[:3]):
             raise ValueError(f"The columns {', '.join(required_columns)} must be provided for train.classify.")
 
-        _train.classify(df[required_columns].values.tolist(), name, model_id)
+        # Nothing to update an existing model with,
+        # so avoid materializing and sending the data
+        if df.empty:
+            if model_id and not name:
+                _logging.debug(": No rows to train Classify Wrangle, skipping")
+                return
+            _logging.warning(": No rows to train Classify Wrangle, creating an empty model")
+
+        _train.classify(_rows(df, required_columns), name, model_id)
 
     _schema["write"] = """
         type: object
@@ -157,9 +180,11 @@ class extract():
             raise ValueError(f"It is not possible to set the variant of an existing model.")
 
         # Select only specific columns if user requests them
+        # Only the names are needed, so avoid copying the data into a new dataframe
         if columns is not None:
             columns = _wildcard_expansion(df.columns, columns)
-            df = df[columns]
+        else:
+            columns = df.columns.to_list()
 
         # Older versions do not have a variant, default to pattern
         if variant is None and name:
@@ -177,7 +202,7 @@ class extract():
             try:
                 required_columns = [
                         version for version in versions
-                        if set(version["columns"]).issubset(set(df.columns.to_list()))
+                        if set(version["columns"]).issubset(set(columns))
                     ][0]['columns']
             except:
                 required_columns = ['Find', 'Output', 'Notes']
@@ -185,10 +210,18 @@ class extract():
         elif variant == 'extract-ai':
             required_columns = ['Find', 'Description', 'Type', 'Default', 'Examples', 'Enum', 'Notes']
             col_len = 7
-        if not required_columns == list(df.columns[:col_len]):
+        if not required_columns == list(columns[:col_len]):
             raise ValueError(f"The columns {', '.join(required_columns)} must be provided for train.extract.")
 
-        _train.extract(df[required_columns].values.tolist(), name, model_id, variant)
+        # Nothing to update an existing model with,
+        # so avoid materializing and sending the data
+        if df.empty:
+            if model_id and not name:
+                _logging.debug(": No rows to train Extract Wrangle, skipping")
+                return
+            _logging.warning(": No rows to train Extract Wrangle, creating an empty model")
+
+        _train.extract(_rows(df, required_columns), name, model_id, variant)
 
     _schema["write"] = """
         type: object
@@ -795,15 +828,25 @@ class standardize():
         _logging.info(f": Training Standardize Wrangle")
 
         # Select only specific columns if user requests them
+        # Only the names are needed, so avoid copying the data into a new dataframe
         if columns is not None:
             columns = _wildcard_expansion(df.columns, columns)
-            df = df[columns]
+        else:
+            columns = df.columns.to_list()
 
         required_columns = ['Find', 'Replace', 'Notes']
-        if not required_columns == list(df.columns[:3]):
+        if not required_columns == list(columns[:3]):
             raise ValueError(f"The columns {', '.join(required_columns)} must be provided for train.standardize.")
 
-        _train.standardize(df[required_columns].values.tolist(), name, model_id)
+        # Nothing to update an existing model with,
+        # so avoid materializing and sending the data
+        if df.empty:
+            if model_id and not name:
+                _logging.debug(": No rows to train Standardize Wrangle, skipping")
+                return
+            _logging.warning(": No rows to train Standardize Wrangle, creating an empty model")
+
+        _train.standardize(_rows(df, required_columns), name, model_id)
 
     _schema["write"] = """
         type: object
@@ -1,11 +1,19 @@
 """
 Functions for interacting with user and app data
 """
+import time as _time
 from . import config as _config
 from . import auth as _auth
 from . import utils as _utils
 
 
+# Model metadata is looked up for every call to functions such as
+# extract.custom or standardize. Cache it briefly so that a model used
+# repeatedly within a recipe is only requested once.
+_model_cache = {}
+_model_cache_ttl = 60
+
+
 class user():
     """
     Get user data
@@ -54,6 +62,25 @@ def model(id: str):
         raise RuntimeError(f'Something went wrong trying to access model {id}')
 
 
+def _model_cached(id: str) -> dict:
+    """
+    Get a model definition, reusing a recent result if available.
+    The returned dict is shared and must not be modified.
+
+    :param id: model ID
+    :returns: Dict of model properties
+    """
+    cached = _model_cache.get(id)
+    if cached and _time.monotonic() - cached[0] < _model_cache_ttl:
+        return cached[1]
+
+    metadata = model(id)
+    # Don't cache lookups for models that don't exist
+    if metadata.get('message', None) != 'error':
+        _model_cache[id] = (_time.monotonic(), metadata)
+    return metadata
+
+
 def model_update(id: str, metadata: dict) -> None:
     """
     Update the metadata for a model
@@ -70,6 +97,7 @@ def model_update(id: str, metadata: dict) -> None:
                     'json': metadata
                 }
             )
+    _model_cache.pop(id, None)
     if response.status_code in [401, 403]:
         raise RuntimeError(f'Access denied to model {id}')
     elif not response.ok:
@@ -4,6 +4,8 @@ Functions to extract information from unstructured text.
 import re as _re
 from typing import Union as _Union
 import concurrent.futures as _futures
+import copy as _copy
+import functools as _functools
 import json as _json
 import logging as _logging
 import pandas as _pd
@@ -50,6 +52,22 @@ def address(
     return results
 
 
+def _ai_row_key(value):
+    """
+    Get a hashable key identifying a row sent to extract.ai.
+    Types are included so values such as 1 and 1.0,
+    which are sent to the model differently, are kept apart.
+
+    :param value: A scalar, list or dict of values for a row
+    """
+    if isinstance(value, dict):
+        return (dict, tuple((k, _ai_row_key(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_ai_row_key(v) for v in value))
+    hash(value)
+    return (type(value), value)
+
+
 def ai(
     input,
     api_key: str,
@@ -62,6 +80,10 @@ def ai(
     messages: list = [],
     url: str = "https://api.openai.com/v1/chat/completions",
     strict: bool = False,
+    dedupe: bool = True,
+    batch_size: int = 1,
+    batch_api: bool = False,
+    cache: bool = False,
     **kwargs
 ) -> _Union[dict, list]:
     """
@@ -89,6 +111,13 @@ def ai(
     :param url: (Optional) Override the endpoint. Must implement the OpenAI chat completions API schema with function calling.
     :param strict: (Optional) Enable strict mode. Default False. If True, the function will be required to match the schema, \
         but may be more limited in the schema it can return.
+    :param dedupe: (Optional) Only send each unique input to the model once. Default True.
+    :param batch_size: (Optional) Number of inputs to send to the model in each request. Default 1. \
+        If the model doesn't return a result for every input in a batch, those inputs are retried individually.
+    :param batch_api: (Optional) Submit all inputs using the OpenAI Batch API and wait for the results. \
+        This is lower cost but can take up to 24 hours. Default False.
+    :param cache: (Optional) Reuse responses from identical earlier requests in this session \
+        rather than calling the model again. Default False.
 
     :return: A scalar or list of extracted information.
     """
@@ -101,6 +130,9 @@ def ai(
     if output is None and model_id is None:
         raise ValueError("output or model_id must be specified.")
 
+    # Fail before sending any requests if the key can't be valid
+    _openai._check_api_key(api_key, url)
+
     output_generic_key = False
     # If output was provided as a string
     # Then convert to JSON schema structure
@@ -329,17 +361,112 @@ def ai(
         **kwargs
     }
 
+    # Identical rows give identical prompts, so only send each unique row once
+    rows = input
+    row_index = None
+    if dedupe:
+        try:
+            keys = {}
+            rows = []
+            row_index = []
+            for value in input:
+                key = _ai_row_key(value)
+                if key not in keys:
+                    keys[key] = len(rows)
+                    rows.append(value)
+                row_index.append(keys[key])
+        except TypeError:
+            # Unhashable values, send every row as is
+            rows = input
+            row_index = None
+
+        if len(rows) == len(input):
+            rows = input
+            row_index = None
+
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
     _logging.info(f": Extracting data using AI model :: model_id :: {model_id}, thread_count :: {threads}")
-    with _futures.ThreadPoolExecutor(max_workers=threads) as executor:
-        results = list(executor.map(
-            _openai.chatGPT,
-            input, 
-            [api_key] * len(input),
-            [settings] * len(input),
-            [url] * len(input),
-            [timeout] * len(input),
-            [retries] * len(input),
-        ))
+    if batch_api:
+        results = _openai.chatGPT_batch(rows, api_key, settings, url)
+    elif batch_size == 1:
+        # No point starting more threads than there are rows
+        with _futures.ThreadPoolExecutor(max_workers=max(1, min(threads, len(rows)))) as executor:
+            results = list(executor.map(
+                _openai.chatGPT,
+                rows, 
+                [api_key] * len(rows),
+                [settings] * len(rows),
+                [url] * len(rows),
+                [timeout] * len(rows),
+                [retries] * len(rows),
+                [cache] * len(rows),
+            ))
+    else:
+        # Ask for a list of results, one per input, so that several
+        # inputs share a single request and a single copy of the prompt
+        batch_settings = {
+            **settings,
+            "messages": settings["messages"] + [{
+                "role": "system",
+                "content": " ".join([
+                    "The data is a list of separate items.",
+                    "Return one entry in results for each item, in the same order.",
+                ])
+            }],
+            "tools": [{
+                **settings["tools"][0],
+                "function": {
+                    **settings["tools"][0]["function"],
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "results": {
+                                "type": "array",
+                                "items": settings["tools"][0]["function"]["parameters"]
+                            }
+                        },
+                        "required": ["results"],
+                        "additionalProperties": False,
+                    }
+                }
+            }]
+        }
+
+        def _extract_batch(batch):
+            response = _openai.chatGPT(batch, api_key, batch_settings, url, timeout, retries, cache)
+            batch_results = response.get("results") if isinstance(response, dict) else None
+            if (
+                isinstance(batch_results, list) and
+                len(batch_results) == len(batch) and
+                all(isinstance(x, dict) for x in batch_results)
+            ):
+                return batch_results
+
+            # Results can't be matched to the inputs, so fall back to one request per input
+            _logging.warning(": AI model did not return a result for each input in a batch, retrying individually")
+            return [
+                _openai.chatGPT(row, api_key, settings, url, timeout, retries, cache)
+                for row in batch
+            ]
+
+        batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+        with _futures.ThreadPoolExecutor(max_workers=max(1, min(threads, len(batches)))) as executor:
+            results = [
+                result
+                for batch_results in executor.map(_extract_batch, batches)
+                for result in batch_results
+            ]
+
+    if row_index is not None:
+        # Copy repeated results so rows don't share mutable objects
+        seen = set()
+        expanded = []
+        for i in row_index:
+            expanded.append(_copy.deepcopy(results[i]) if i in seen else results[i])
+            seen.add(i)
+        results = expanded
 
     if _needs_remap:
         results = [
@@ -381,6 +508,9 @@ def attributes(
     :param bound: (Optional, default mid). When returning an object, if the input is a range. e.g. 10-20mm, set the value to return. min, mid or max.
     """
     
+    if first_element and not type:
+        raise TypeError('first_element must be used with a specified attribute_type')
+
     if isinstance(input, str): 
         json_data = [input]
     else:
@@ -403,19 +533,21 @@ def attributes(
     
     batch_size = 1000
 
-    results = _batching.batch_api_calls(url, params, json_data, batch_size)
+    # Identical values give identical attributes, so only send each once
+    results = _batching.batch_unique_api_calls(url, params, json_data, batch_size)
 
     if first_element and type:
         results = [x[0] if len(x) >= 1 else "" for x in results]
-
-    if first_element and not type:
-        raise TypeError('first_element must be used with a specified attribute_type')
     
     if isinstance(input, str): results = results[0]
 
     return results
 
 
+# Matches any unicode letter or digit
+_alnum_pattern = _re.compile(r'[^\W_]')
+
+
 def codes(
     input: _Union[str, list],
     first_element: bool = False,
@@ -438,7 +570,14 @@ def codes(
     params = {'responseFormat': 'array', **kwargs}
     batch_size = 10000
 
-    results = _batching.batch_api_calls(url, params, json_data, batch_size)
+    # Codes are alphanumeric, so values without any letters
+    # or digits (e.g. empty strings) don't need to be sent
+    has_alnum = [bool(_alnum_pattern.search(str(x))) for x in json_data]
+    to_send = [x for x, send in zip(json_data, has_alnum) if send]
+
+    # Identical values give identical codes, so only send each once
+    sent = iter(_batching.batch_unique_api_calls(url, params, to_send, batch_size) if to_send else [])
+    results = [next(sent) if send else [] for send in has_alnum]
 
     if first_element:
         results = [x[0] if len(x) >= 1 else "" for x in results]
@@ -448,6 +587,22 @@ def codes(
     return results
 
 
+def _validate_model_id(model_id: str) -> None:
+    """
+    Check a model_id is correctly formatted.
+    Raises a ValueError if not.
+
+    :param model_id: The model_id to check
+    """
+    # If the Model Id is not appropriate, raise error (Only for Recipes)
+    if isinstance(model_id, dict):
+        raise ValueError('Incorrect model_id type.\nIf using Recipe, may be missing "${ }" around value')
+    
+    # Checking to see if GUID format is correct
+    if [len(x) for x in model_id.split('-')] != [8, 4, 4]:
+        raise ValueError('Incorrect or missing values in model_id. Check format is XXXXXXXX-XXXX-XXXX')
+
+
 def custom(
     input: _Union[str, list],
     model_id: str,
@@ -476,13 +631,11 @@ def custom(
     else:
         raise TypeError('Invalid input data provided. The input must be either a string or a list of strings.')
         
-    # If the Model Id is not appropriate, raise error (Only for Recipes)
-    if isinstance(model_id, dict):
-        raise ValueError('Incorrect model_id type.\nIf using Recipe, may be missing "${ }" around value')
-    
-    # Checking to see if GUID format is correct
-    if [len(x) for x in model_id.split('-')] != [8, 4, 4]:
-        raise ValueError('Incorrect or missing values in model_id. Check format is XXXXXXXX-XXXX-XXXX')
+    _validate_model_id(model_id)
+
+    # Nothing to extract so there is no need to look up the model
+    if not json_data:
+        return []
 
     url = f'{_config.api_host}/wrangles/extract/custom'
     params = {
@@ -496,20 +649,23 @@ def custom(
         **kwargs
     }
 
-    model_properties = _data.model(model_id)
-    model_content = _data.model_content(model_id)
+    model_properties = _data._model_cached(model_id)
 
-    model_labels = set()
-    for item in model_content['Data']:  
-        if len(item) >= 2: 
-            if ':' in item[1]: 
-                label = item[1].split(':')[0]  # Second column typically contains the label/type  
-                model_labels.add(label.strip())
-    
     # If model_id format is correct but no mode_id exists
     if model_properties.get('message', None) == 'error':
         raise ValueError('Incorrect model_id.\nmodel_id may be wrong or does not exists')
 
+    # The model's labels are only needed to fill in empty labels
+    # so avoid downloading the training data otherwise
+    model_labels = set()
+    if use_labels and include_empty_labels:
+        model_content = _data.model_content(model_id)
+        for item in model_content['Data']:  
+            if len(item) >= 2: 
+                if ':' in item[1]: 
+                    label = item[1].split(':')[0]  # Second column typically contains the label/type  
+                    model_labels.add(label.strip())
+
     # Set appropriate batch_size
     if 'ai' in (model_properties.get('variant', '') or ''):
         batch_size = 20
@@ -522,7 +678,8 @@ def custom(
     if purpose != 'extract':
         raise ValueError(f'Using {purpose} model_id {model_id} in an extract function.')
     
-    results = _batching.batch_api_calls(url, params, json_data, batch_size)
+    # Identical values give identical results, so only send each once
+    results = _batching.batch_unique_api_calls(url, params, json_data, batch_size)
 
     if isinstance(results, dict) and "data" in results and "columns" in results:
         if len(results["columns"]) == 1:
@@ -591,13 +748,18 @@ def html(
     }
     batch_size = 10000
 
-    results = _batching.batch_api_calls(url, params, json_data, batch_size)
+    # HTML values are large and often repeated, so only send each once
+    results = _batching.batch_unique_api_calls(url, params, json_data, batch_size)
 
     if isinstance(input, str): results = results[0]
     
     return results
 
     
+# Matches any unicode letter
+_letter_pattern = _re.compile(r'[^\W\d_]')
+
+
 def properties(
     input: _Union[str, list],
     type: str = None,
@@ -617,6 +779,9 @@ def properties(
     :param return_data_type: (Optional) The format to return the data, as a list or as a string.
     :return: A single or list with the extracted properties. Each extracted property may be a dict or list depending on settings.
     """
+    if first_element and not type:
+        raise TypeError('first_element must be used with a specified property_type')
+
     if isinstance(input, str): 
         json_data = [input]
     else:
@@ -628,14 +793,22 @@ def properties(
     if type is not None: params['dataType'] = type
     batch_size = 10000
 
-    results = _batching.batch_api_calls(url, params, json_data, batch_size)
+    if type is not None:
+        # Properties are words, so values without any letters
+        # can't contain a match and don't need to be sent
+        has_letters = [bool(_letter_pattern.search(str(x))) for x in json_data]
+        to_send = [x for x, send in zip(json_data, has_letters) if send]
+
+        # Identical values give identical properties, so only send each once
+        sent = iter(_batching.batch_unique_api_calls(url, params, to_send, batch_size) if to_send else [])
+        results = [next(sent) if send else [] for send in has_letters]
+    else:
+        # Identical values give identical properties, so only send each once
+        results = _batching.batch_unique_api_calls(url, params, json_data, batch_size)
     
     if first_element and type:
         results = [x[0] if len(x) >= 1 else "" for x in results]
 
-    if first_element and not type:
-        raise TypeError('first_element must be used with a specified property_type')
-
     if isinstance(input, str): results = results[0]
     
     if return_data_type == 'string': results = [', '.join(x) if x != [] else '' for x in results]
@@ -643,6 +816,28 @@ def properties(
     return results
 
 
+# Custom word boundary that considers a space, a comma,
+# the start of the string, or the end of the string as a boundary
+_word_boundary = r'(?:\s|,|^|$)'
+_whitespace_pattern = _re.compile(r'\s+')
+_token_split_pattern = _re.compile(r'\s|,')
+
+
+@_functools.lru_cache(maxsize=4096)
+def _remove_word_pattern(word: str, flags: int) -> _re.Pattern:
+    """
+    Get a compiled pattern matching a whole word.
+    Cached as the same words are typically removed from many rows.
+
+    :param word: Word to match. Special characters are escaped.
+    :param flags: Regex flags
+    """
+    return _re.compile(
+        r'{}{}{}'.format(_word_boundary, _re.escape(word), _word_boundary),
+        flags=flags
+    )
+
+
 # SUPER MARIO
 def remove_words(input: _Union[str, list], to_remove: list, tokenize_to_remove: bool, ignore_case: bool):
     """
@@ -672,9 +867,6 @@ def remove_words(input: _Union[str, list], to_remove: list, tokenize_to_remove:
         # flatten the _remove lists if necessary
         _remove = _flatten_lists(_remove)
         
-        #Custom word boundary that considers a space, the start of the string, or the end of the string as a boundary
-        boundary = r'(?:\s|,|^|$)'
-        
         text = _in
         for remove in _remove:
             # Convert to string since _re.escape only accepts strings
@@ -683,31 +875,47 @@ def remove_words(input: _Union[str, list], to_remove: list, tokenize_to_remove:
             # if Tokenize is true
             if tokenize_to_remove == True:
                 # Tokenize                        
-                token_remove = _re.split(r'\s|,', remove)
-                for subtoken in token_remove:
-                    subtoken = _re.escape(subtoken)  # escape the special characters just in case
-
-                    # Use the custom word boundary in the regex pattern
-                    pattern = r'{}{}{}'.format(boundary, subtoken, boundary)
-
+                for subtoken in _token_split_pattern.split(remove):
                     # Use re.sub with the custom pattern, and remove extra spaces
-                    text = _re.sub(pattern, ' ', text, flags=flags).strip()
+                    text = _remove_word_pattern(subtoken, flags).sub(' ', text).strip()
                 
             else:
-                remove = _re.escape(remove) # escape the special characters just in case
-                
-                # Use the custom word boundary in the regex pattern
-                pattern = r'{}{}{}'.format(boundary, remove, boundary)
-                
                 # Use re.sub with the custom pattern, and remove extra spaces
-                text = _re.sub(pattern, ' ', text, flags=flags).strip()
+                text = _remove_word_pattern(remove, flags).sub(' ', text).strip()
                 
             # remove any double spaces
-            text = _re.sub(r'\s+', ' ', text)
+            text = _whitespace_pattern.sub(' ', text)
         results.append(text)
     return results
 
 
+_bracket_patterns = {
+    'round': r'\(.*?\)',
+    'square': r'\[.*?\]',
+    'curly': r'\{.*?\}',
+    'angled': r'<.*?>'
+}
+_bracket_characters_table = str.maketrans('', '', '[]{}()<>')
+
+
+@_functools.lru_cache(maxsize=None)
+def _compile_brackets_pattern(find: tuple) -> _re.Pattern:
+    """
+    Get a compiled pattern matching the requested types of brackets
+
+    :param find: Tuple of bracket types. ('all',) matches any type.
+    """
+    if find != ('all',):
+        return _re.compile('|'.join(
+            _bracket_patterns[element]
+            for element in find
+            if element != 'all'
+        ))
+    else:
+        # Default pattern matches all types of brackets if find is empty
+        return _re.compile('|'.join(_bracket_patterns.values()))
+
+
 def brackets(
     input: str,
     find: list = _Union[str, list],
@@ -722,32 +930,21 @@ def brackets(
     :return: List of extracted values
     """
     _logging.info(": Extracting text from brackets")
-    results = []
-    bracket_patterns = {
-    'round': r'\(.*?\)',
-    'square': r'\[.*?\]',
-    'curly': r'\{.*?\}',
-    'angled': r'<.*?>'
-    }
 
     if isinstance(find, str): find = [find]
 
-    if find != ['all']:
-        patterns = [bracket_patterns[element] for element in find if element != 'all']
-        pattern = '|'.join(patterns)
-    else:
-        # Default pattern matches all types of brackets if find is empty
-        pattern = '|'.join(bracket_patterns.values())
+    # Normalize the requested types so that equivalent
+    # requests share a single compiled pattern
+    find = set(find)
+    if find == {'all'} or find.issuperset(_bracket_patterns):
+        find = ('all',)
+    pattern = _compile_brackets_pattern(tuple(sorted(find)))
 
-    for item in input:
-        # Finds all matches inside of brackets in item (list of strings)
-        re = _re.findall(pattern, item)
-    
-        # Traverse list and remove all brackets if include_brackets is False
-        if include_brackets is False:
-            re = [_re.sub(r'\[|\]|{|}|\(|\)|<|>', '', re[x]) for x in range(len(re))]
-            results.append(', '.join(re))
-        else:
-            results.append(', '.join(re))
-        
-    return results
+    if include_brackets:
+        return [', '.join(pattern.findall(item)) for item in input]
+
+    # Remove all brackets from the matches
+    return [
+        ', '.join(pattern.findall(item)).translate(_bracket_characters_table)
+        for item in input
+    ]
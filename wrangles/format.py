@@ -281,39 +281,26 @@ def remove_duplicates(input_list: list, ignore_case: bool = False) -> list:
     Remove duplicates from a list. Preserves input order.
     """
     _logging.debug(f": Removing duplicates :: ignore_case :: {ignore_case}")
-    results = []
-    for row in input_list:
-        # If row is a list, remove duplicates while ignoring case
-        if isinstance(row, list) and ignore_case:
-            seen = set()
-            results.append([x for x in row if x.lower() not in seen and not seen.add(x.lower())])
-
-        # If row is a list, remove duplicates whith case considered
-        elif isinstance(row, list) and not ignore_case:
-            results.append(list(dict.fromkeys(row)))
-        
-        # If row is a string, recursively remove duplicates and return a string while ignoring case
-        elif isinstance(row, str) and ignore_case:
-            seen = set()
-            result = []
-            for word in row.split(' '):
-                if word.lower() not in seen:
-                    seen.add(word.lower())
-                    result.append(word)
-            results.append(' '.join(result))
-        
-        # If row is a string, recursively remove duplicates and return a string
-        elif isinstance(row, str) and not ignore_case:
-            # Convert row to a list
-            split_row = row.split(' ')
-            # Recursion
-            output = remove_duplicates([split_row])
-            results.append(' '.join(output[0]))
-
-        else:
-            results.append(row) # pragma: no cover 
-    
-    return results
+    # Choose how to dedupe once rather than for every row
+    if ignore_case:
+        def _dedupe(values: list) -> list:
+            # Keep the first value seen for each lowercase key
+            unique = {}
+            for value in values:
+                unique.setdefault(value.lower(), value)
+            return list(unique.values())
+    else:
+        def _dedupe(values: list) -> list:
+            return list(dict.fromkeys(values))
+
+    return [
+        # If row is a list, remove duplicates from the list
+        _dedupe(row) if isinstance(row, list)
+        # If row is a string, remove duplicate words and return a string
+        else ' '.join(_dedupe(row.split(' '))) if isinstance(row, str)
+        else row
+        for row in input_list
+    ]
 
 
 def retrieved_content_to_text(responses: list) -> str:
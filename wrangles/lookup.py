@@ -41,7 +41,7 @@ def lookup(
     if [len(x) for x in model_id.split('-')] != [8, 4, 4]:
         raise ValueError('Incorrect or missing values in model_id. Check format is XXXXXXXX-XXXX-XXXX')
 
-    metadata = _data.model(model_id)
+    metadata = _data._model_cached(model_id)
     # If model_id format is correct but no mode_id exists
     if metadata.get('message', None) == 'error':
         raise ValueError('Incorrect model_id.\nmodel_id may be wrong or does not exists')
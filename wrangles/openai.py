@@ -1,19 +1,89 @@
 import base64 as _base64
+import copy as _copy
+import hashlib as _hashlib
+import threading as _threading
 import yaml as _yaml
 import json as _json
-import copy as _copy
 import concurrent.futures as _futures
 from itertools import chain as _chain
 import logging as _logging
+import random as _random
 import requests as _requests
 import numpy as _np
 import time as _time
+from urllib.parse import urlparse as _urlparse
 try:
     from yaml import CSafeDumper as _YAMLDumper
 except ImportError:
     from yaml import SafeDumper as _YAMLDumper
 
 
+# Shared session so the many parallel requests made for a
+# column reuse pooled keep-alive connections rather than
+# opening a new connection and TLS handshake for every row.
+# The pool is sized above typical thread counts, as connections
+# beyond pool_maxsize are discarded after each request.
+_session = _requests.Session()
+_adapter = _requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=100)
+_session.mount('https://', _adapter)
+_session.mount('http://', _adapter)
+
+# Optional cache of successful chatGPT responses, keyed by the full request
+_response_cache = {}
+_response_cache_size = 10000
+_response_cache_lock = _threading.Lock()
+
+
+def _check_api_key(api_key: str, url: str):
+    """
+    Raise an error before sending any requests if no API key
+    is provided for OpenAI. Other endpoints set with url
+    may not require a key so are not checked.
+
+    :param api_key: API Key
+    :param url: The endpoint the key will be sent to
+    """
+    if (
+        _urlparse(url).hostname == "api.openai.com" and
+        (not isinstance(api_key, str) or not api_key.strip())
+    ):
+        raise ValueError("API Key provided is missing or invalid.")
+
+
+def _row_settings(data: any, settings: dict) -> dict:
+    """
+    Get the request settings for a single row,
+    adding the row's data as a user message.
+
+    :param data: The data for that row
+    :param settings: Custom model settings shared by all rows
+    """
+    if isinstance(data, (dict, list)):
+        content = _yaml.dump(
+            data,
+            indent=2,
+            sort_keys=False,
+            allow_unicode=True,
+            Dumper=_YAMLDumper,
+            width=1000
+        )
+    else:
+        content = str(data)
+
+    # Only the messages differ between rows, so share the
+    # rest of the settings (including the schema) rather than copying them
+    settings_local = {
+        **settings,
+        "messages": settings["messages"] + [
+            {
+                "role": "user",
+                "content": f"\n---Data:\n---\n{content}"
+            }
+        ]
+    }
+    return settings_local
+
+
 def chatGPT(
     data: any,
     api_key: str,
@@ -21,6 +91,7 @@ def chatGPT(
     url: str = "https://api.openai.com/v1/chat/completions",
     timeout: int = None,
     retries: int = 0,
+    cache: bool = False,
 ):
     """
     Submit a request to openAI chatGPT.
@@ -30,26 +101,16 @@ def chatGPT(
     :param settings: Custom model settings
     :param timeout: Time limit to apply to the request
     :param retries: Number of times to retry if the request fails
+    :param cache: Reuse the response from an identical earlier request in this session
     """
-    if isinstance(data, (dict, list)):
-        content = _yaml.dump(
-            data,
-            indent=2,
-            sort_keys=False,
-            allow_unicode=True,
-            Dumper=_YAMLDumper,
-            width=1000
-        )
-    else:
-        content = str(data)
+    settings_local = _row_settings(data, settings)
 
-    settings_local = _copy.deepcopy(settings)
-    settings_local["messages"].append(
-        {
-            "role": "user",
-            "content": f"\n---Data:\n---\n{content}"
-        }
-    )
+    if cache:
+        cache_key = _hashlib.sha256(
+            (url + _json.dumps(settings_local, sort_keys=True, default=str)).encode('utf-8')
+        ).hexdigest()
+        if cache_key in _response_cache:
+            return _copy.deepcopy(_response_cache[cache_key])
 
     if not isinstance(retries, int) or retries < 0:
         raise ValueError("Retries must be a positive integer")
@@ -61,13 +122,14 @@ def chatGPT(
     retry_count = 0
     while (retries + 1):
         try:
-            response = _requests.post(
+            response = _session.post(
                 url = url,
                 headers = {
                     "Authorization": f"Bearer {api_key}"
                 },
                 json = settings_local,
-                timeout=timeout
+                # Give retries progressively longer to respond, up to 4x the original timeout
+                timeout=min(timeout * 2 ** retry_count, timeout * 4) if timeout else timeout
             )
         except _requests.exceptions.ReadTimeout:
             if retries == 0:
@@ -108,14 +170,22 @@ def chatGPT(
         retry_count += 1
         if retries >= 0:
             _logging.warning(f": Retrying OpenAI request :: attempt :: {retry_count}")
-            _time.sleep(backoff_time)
+            # Full jitter so parallel rows that failed together don't all retry together
+            _time.sleep(_random.uniform(0, backoff_time))
             backoff_time *= 2
 
     if response and response.ok:
         try:
-            return _json.loads(
+            result = _json.loads(
                 response.json()['choices'][0]['message']['tool_calls'][0]['function']['arguments']
             )
+            if cache:
+                with _response_cache_lock:
+                    # Drop the oldest response once the cache is full
+                    if len(_response_cache) >= _response_cache_size:
+                        _response_cache.pop(next(iter(_response_cache)))
+                    _response_cache[cache_key] = _copy.deepcopy(result)
+            return result
         except:
             pass
 
@@ -134,6 +204,106 @@ def chatGPT(
         settings_local.get("tools", [])[0]["function"]["parameters"]["required"]
     }
 
+def chatGPT_batch(
+    data: list,
+    api_key: str,
+    settings: dict,
+    url: str = "https://api.openai.com/v1/chat/completions",
+    poll_interval: int = 30,
+):
+    """
+    Submit requests for many rows using the OpenAI Batch API
+    and wait for the batch to complete.
+
+    Batches are processed asynchronously by OpenAI at a lower
+    cost, but may take up to 24 hours to complete.
+
+    :param data: List of the data for each row
+    :param api_key: OpenAI API Key
+    :param settings: Custom model settings
+    :param url: The chat completions endpoint. Files and batches are created relative to this.
+    :param poll_interval: Seconds to wait between checking the status of the batch
+    :return: A list of results, one for each row
+    """
+    endpoint = _urlparse(url).path
+    base_url = url.rsplit("/chat/completions", 1)[0]
+    headers = {"Authorization": f"Bearer {api_key}"}
+    required = settings.get("tools", [])[0]["function"]["parameters"]["required"]
+
+    def _raise_for_error(response, action):
+        if not response.ok:
+            try:
+                error_message = response.json()['error']['message']
+            except:
+                error_message = response.text
+            raise RuntimeError(f"Unable to {action} :: {error_message}")
+
+    requests_file = "\n".join(
+        _json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": endpoint,
+            "body": _row_settings(row, settings)
+        })
+        for i, row in enumerate(data)
+    )
+
+    _logging.info(f": Submitting OpenAI batch :: rows :: {len(data)}")
+    response = _session.post(
+        f"{base_url}/files",
+        headers=headers,
+        data={"purpose": "batch"},
+        files={"file": ("requests.jsonl", requests_file.encode("utf-8"))}
+    )
+    _raise_for_error(response, "upload batch file")
+
+    response = _session.post(
+        f"{base_url}/batches",
+        headers=headers,
+        json={
+            "input_file_id": response.json()["id"],
+            "endpoint": endpoint,
+            "completion_window": "24h"
+        }
+    )
+    _raise_for_error(response, "create batch")
+    batch = response.json()
+
+    while batch["status"] not in ("completed", "failed", "expired", "cancelled"):
+        _time.sleep(poll_interval)
+        response = _session.get(f"{base_url}/batches/{batch['id']}", headers=headers)
+        _raise_for_error(response, "check batch status")
+        batch = response.json()
+        _logging.debug(f": OpenAI batch :: {batch['id']} :: {batch['status']}")
+
+    if batch["status"] != "completed" or not batch.get("output_file_id"):
+        raise RuntimeError(f"OpenAI batch {batch['id']} did not complete :: {batch['status']}")
+
+    response = _session.get(f"{base_url}/files/{batch['output_file_id']}/content", headers=headers)
+    _raise_for_error(response, "download batch results")
+
+    # Rows missing from the output failed within the batch
+    results = [
+        {param: "Failed" for param in required}
+        for _ in data
+    ]
+    for line in response.text.splitlines():
+        if not line.strip():
+            continue
+        record = _json.loads(line)
+        try:
+            results[int(record["custom_id"])] = _json.loads(
+                record["response"]["body"]['choices'][0]['message']['tool_calls'][0]['function']['arguments']
+            )
+        except:
+            try:
+                error_message = record["response"]["body"]["error"]["message"]
+            except:
+                error_message = "Failed"
+            results[int(record["custom_id"])] = {param: error_message for param in required}
+
+    return results
+
 def _divide_batches(l, n):
     """
     Yield successive n-sized
@@ -171,7 +341,7 @@ def _embedding_thread(
     backoff_time = 1
     while (retries + 1):
         try:
-            response = _requests.post(
+            response = _session.post(
                 url=url,
                 headers={
                     "Authorization": f"Bearer {api_key}"
@@ -14,6 +14,8 @@ import re as _re
 import warnings as _warnings
 import concurrent.futures as _futures
 import time as _time
+import copy as _copy
+import functools as _functools
 import pandas as _pandas
 import requests as _requests
 from . import recipe_wrangles as _recipe_wrangles
@@ -34,9 +36,9 @@ from .utils import (
     replace_templated_values as _replace_templated_values
 )
 try:
-    from yaml import CSafeDumper as _YAMLDumper
+    from yaml import CSafeLoader as _YAMLLoader
 except ImportError:
-    from yaml import SafeDumper as _YAMLDumper
+    from yaml import SafeLoader as _YAMLLoader
 
 _logging.getLogger().setLevel(_logging.INFO)
 
@@ -47,6 +49,46 @@ _logging.getLogger().setLevel(_logging.INFO)
 # but will also investigate if there is a better long term solution
 _warnings.simplefilter(action='ignore', category=_pandas.errors.PerformanceWarning)
 
+# Shallow copies of this are used when a recipe has no data
+# which is much cheaper than constructing a new dataframe
+_empty_dataframe = _pandas.DataFrame()
+
+
+@_functools.lru_cache(maxsize=256)
+def _parse_recipe_string(recipe_string: str) -> _typing.Any:
+    """
+    Parse a YAML recipe string. Results are cached so that
+    identical recipes are only parsed once.
+
+    The returned object is shared and must not be modified.
+    Use _copy_parsed_recipe to get an object that can be edited.
+
+    :param recipe_string: YAML recipe as a string
+    :return: Parsed recipe object
+    """
+    return _yaml.load(recipe_string, Loader=_YAMLLoader)
+
+
+def _copy_parsed_recipe(obj: _typing.Any) -> _typing.Any:
+    """
+    Copy a parsed recipe so it can be edited without
+    changing the cached version.
+
+    Safe loaded YAML only contains dicts, lists and sets
+    alongside immutable scalars, so only the containers
+    need to be copied. This is cheaper than a deepcopy.
+
+    :param obj: Parsed recipe object from _parse_recipe_string
+    :return: Copy of the recipe object
+    """
+    if isinstance(obj, dict):
+        return {k: _copy_parsed_recipe(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_parsed_recipe(v) for v in obj]
+    if isinstance(obj, set):
+        return set(obj)
+    return obj
+
 
 def _load_recipe(
     recipe: str,
@@ -72,19 +114,19 @@ def _load_recipe(
     if isinstance(recipe, str) and "\n" not in recipe:
         _logging.info(f": Reading Recipe :: {recipe}")
     
+    # Dict to store functions stored within a model
+    model_functions = {}
+
     # Load the recipe from the various supported formats
     if not isinstance(recipe, str):
-        try:
-            # If user passes in a pre-parsed recipe, convert back to YAML
-            recipe = _yaml.dump(recipe, sort_keys=False, Dumper=_YAMLDumper, allow_unicode=True)
-        except:
+        # If user passes in a pre-parsed recipe, use it
+        # directly rather than round tripping through YAML
+        if not isinstance(recipe, (dict, list)):
             raise ValueError('Recipe passed in as an invalid type')
-
-    # Dict to store functions stored within a model
-    model_functions = {}
+        recipe_string = None
 
     # If the recipe to read is from "https://" or "http://"
-    if 'https://' == recipe[:8] or 'http://' == recipe[:7]:
+    elif 'https://' == recipe[:8] or 'http://' == recipe[:7]:
         response = _requests.get(recipe)
         if str(response.status_code)[0] != '2':
             raise ValueError(f'Error getting recipe from url: {response.url}\nReason: {response.reason}-{response.status_code}')
@@ -211,7 +253,10 @@ def _load_recipe(
 
             variables[k] = func(**args)
 
-    recipe_object = _yaml.safe_load(recipe_string)
+    if recipe_string is None:
+        recipe_object = _copy.deepcopy(recipe)
+    else:
+        recipe_object = _copy_parsed_recipe(_parse_recipe_string(recipe_string))
 
     # Add variables to variables
     variables['recipe_variables'] = {
@@ -285,6 +330,39 @@ def _run_actions(
                 # Append name of wrangle to message and pass through exception
                 raise e.__class__(f"ERROR IN ACTION: {action_type} - {e}").with_traceback(e.__traceback__) from None
 
+# Reads that draw from the global random state, run user code or
+# nested recipes, or share state through the variables and functions.
+# These are read in order so seeded runs stay reproducible.
+_sequential_reads = {'test', 'matrix', 'recipe', 'concurrent', 'memory', 'custom'}
+
+
+def _can_read_concurrently(source, functions: dict) -> bool:
+    """
+    Check whether a source of a blended read can be read
+    on a thread alongside the other sources.
+
+    :param source: A single source from a join, union or concatenate
+    :param functions: A dictionary of named custom functions passed in by the user
+    :return: True if the source only uses built in I/O connectors
+    """
+    if isinstance(source, str):
+        source = {source: {}}
+    if not isinstance(source, dict):
+        return False
+
+    for read_type, read_params in source.items():
+        name = str(read_type).split('.')[0]
+        if name in _sequential_reads or name in functions:
+            return False
+        if name in ['join', 'concatenate', 'union']:
+            if not all(
+                _can_read_concurrently(x, functions)
+                for x in (read_params or {}).get('sources', [])
+            ):
+                return False
+    return True
+
+
 def _read_data(
     recipe: _Union[dict, list],
     functions: dict = None,
@@ -322,7 +400,8 @@ def _read_data(
                     "if" in read_params and
                     not _evaluate_conditional(read_params["if"], variables)
                 ):
-                    return None
+                    # Skip before any connector is looked up or called
+                    continue
 
                 # Divide parameters into general and specific to that type of read
                 params_general = ['columns', 'not_columns', 'where', 'where_params', 'order_by', 'if']
@@ -344,8 +423,28 @@ def _read_data(
                 elif read_type in ['join', 'concatenate', 'union']:
                     dfs = []
                     # Recursively call sub-reads
-                    for source in params_specific['sources']:
-                        result = _read_data(source, functions, variables, input_dataframe)
+                    sources = params_specific['sources']
+                    if len(sources) > 1 and all(
+                        _can_read_concurrently(source, functions)
+                        for source in sources
+                    ):
+                        # Sources that only use built in I/O connectors
+                        # are independent so can be read concurrently
+                        with _futures.ThreadPoolExecutor(max_workers=min(8, len(sources))) as executor:
+                            results_sources = list(executor.map(
+                                _read_data,
+                                sources,
+                                [functions] * len(sources),
+                                [variables] * len(sources),
+                                [input_dataframe] * len(sources)
+                            ))
+                    else:
+                        results_sources = [
+                            _read_data(source, functions, variables, input_dataframe)
+                            for source in sources
+                        ]
+
+                    for result in results_sources:
                         if result is None:
                             # Skip if None returned
                             # e.g. in the case of a false if condition
@@ -360,12 +459,22 @@ def _read_data(
 
                     if read_type == 'join':
                         df = _pandas.merge(dfs[0], dfs[1], **params_specific)
+                    elif len(dfs) == 1 and not params_specific:
+                        # Nothing to combine, but still copy as the
+                        # source may be shared, e.g. the input dataframe
+                        df = dfs[0].copy()
                     elif read_type == 'union':
                         df = _pandas.concat(dfs, **params_specific)
                     elif read_type == 'concatenate':
                         params_specific['axis'] = 1
                         df = _pandas.concat(dfs, **params_specific)
-                    df = df.reset_index(drop=True)
+
+                    # Only reset the index if it isn't already the default
+                    if not (
+                        isinstance(df.index, _pandas.RangeIndex) and
+                        df.index.equals(_pandas.RangeIndex(len(df)))
+                    ):
+                        df = df.reset_index(drop=True)
                 else:
                     # Get the requested function from the connectors module or user defined functions
                     func = _get_nested_function(read_type, _connectors, functions, 'read')
@@ -395,7 +504,10 @@ def _read_data(
             except Exception as e:
                 # Append name of read to message and pass through exception
                 raise e.__class__(f"ERROR IN READ: {read_type} - {e}").with_traceback(e.__traceback__) from None
-    if len(results) == 1:
+    if not results:
+        # All reads were skipped
+        return None
+    elif len(results) == 1:
         return results[0]
     else:
         return results
@@ -867,6 +979,20 @@ def _filter_dataframe(
     """
 
     if where or order_by:
+        # Only columns referenced by the query need to be loaded
+        # into sqlite to evaluate it. Any column whose name appears
+        # in the query text is kept, which may include extras but
+        # never misses one. Quotes in a name can be escaped in SQL
+        # so the name may not appear verbatim - use everything then.
+        query_text = f"{where or ''} {order_by or ''}".lower()
+        query_columns = [
+            column
+            for column in df.columns
+            if str(column).lower() in query_text
+        ]
+        if not query_columns or any('"' in str(column) for column in df.columns):
+            query_columns = df.columns
+
         sql = (
             f"""
             SELECT *
@@ -880,7 +1006,7 @@ def _filter_dataframe(
         # only pass those through the dataframe
         df = df.loc[
             _recipe_wrangles.sql(
-                df,
+                df[query_columns],
                 sql,
                 where_params,
                 preserve_index=True,
@@ -1040,7 +1166,7 @@ def _run_thread(
 
         # If no data is returned, initialize an empty dataframe
         if df is None:
-            df = _pandas.DataFrame()
+            df = _empty_dataframe.copy(deep=False)
 
         # If multiple dataframes are returned, union them
         if isinstance(df, list) and all([isinstance(x, _pandas.DataFrame) for x in df]):
@@ -1054,7 +1180,7 @@ def _run_thread(
         df = dataframe
     else:
         # User hasn't provided anything - initialize empty dataframe
-        df = _pandas.DataFrame()
+        df = _empty_dataframe.copy(deep=False)
 
     # Execute any Wrangles required (allow single or plural)
     if 'wrangles' in recipe.keys():
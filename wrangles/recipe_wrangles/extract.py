@@ -5,9 +5,105 @@ from typing import Union as _Union
 import re as _re
 import logging as _logging
 import pandas as _pd
+import numpy as _np
 from .. import extract as _extract
 from .. import format as _format
 from .. import data as _data
+from ..utils import LazyLoader as _LazyLoader
+
+_pa = _LazyLoader('pyarrow')
+_pc = _LazyLoader('pyarrow.compute')
+
+
+def _join_columns(df: _pd.DataFrame, columns: list, separator: str = ' ') -> list:
+    """
+    Join the values of several columns into a single string per row.
+
+    Equivalent to df[columns].astype(str).aggregate(separator.join, axis=1)
+    without the overhead of calling a function for every row.
+
+    :param df: Dataframe containing the columns
+    :param columns: List of columns to join
+    :param separator: String to place between the values
+    :return: A list with one joined string per row
+    """
+    dtypes = [df[column].dtype for column in columns]
+    if all(
+        isinstance(dtype, _pd.StringDtype) and dtype.storage == 'pyarrow'
+        for dtype in dtypes
+    ):
+        # Arrow backed strings can be joined in a single native kernel,
+        # filling missing values as astype(str) would represent them
+        arrays = [
+            _pc.fill_null(_pa.array(df[column].array), str(dtype.na_value))
+            for column, dtype in zip(columns, dtypes)
+        ]
+        return _pc.binary_join_element_wise(
+            *arrays,
+            _pa.scalar(separator, type=arrays[0].type)
+        ).to_pylist()
+
+    return [
+        separator.join(row)
+        for row in zip(*[df[column].astype(str).tolist() for column in columns])
+    ]
+
+
+def _records(df: _pd.DataFrame) -> list:
+    """
+    Get the rows of a dataframe as a list of dicts.
+
+    Equivalent to df.to_dict(orient='records') without boxing
+    every value of object columns, which dominates for text data.
+
+    :param df: Dataframe to convert
+    :return: A list with a dict of column: value for each row
+    """
+    columns = df.columns.tolist()
+    values = [df.iloc[:, i].tolist() for i in range(len(columns))]
+
+    # Missing values in extension arrays and numpy scalars stored
+    # in object columns need converting, so leave those to pandas
+    if (
+        not columns or
+        any(isinstance(dtype, _pd.api.extensions.ExtensionDtype) for dtype in df.dtypes) or
+        any(
+            isinstance(value, _np.generic)
+            for column_values, dtype in zip(values, df.dtypes)
+            if dtype == object
+            for value in column_values
+        )
+    ):
+        return df.to_dict(orient='records')
+
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _extract_columns(func, df: _pd.DataFrame, columns: list, *args, **kwargs) -> list:
+    """
+    Run an extract function for several columns in a single call.
+    The values from all the columns are sent together, so remote
+    requests are batched as fully as possible and values repeated
+    across columns are only sent once.
+
+    :param func: Extract function that takes a list of values first
+    :param df: Dataframe containing the columns
+    :param columns: List of input columns
+    :return: A list of results for each column
+    """
+    values = [df[column].astype(str).tolist() for column in columns]
+    if len(columns) == 1:
+        return [func(values[0], *args, **kwargs)]
+
+    results = func(
+        [value for column_values in values for value in column_values],
+        *args,
+        **kwargs
+    )
+    return [
+        results[i * len(df):(i + 1) * len(df)]
+        for i in range(len(columns))
+    ]
 
 
 def address(
@@ -58,18 +154,15 @@ def address(
     _logging.info(f": Extracting address {dataType} :: input :: {input}")
     if len(output) == 1 and len(input) > 1:
         df[output[0]] = _extract.address(
-            df[input].astype(str).aggregate(' '.join, axis=1).tolist(),
+            _join_columns(df, input, ' '),
             dataType,
             **kwargs
         )
     else:
-        # Loop through and apply for all columns
-        for input_column, output_column in zip(input, output):
-            df[output_column] = _extract.address(
-                df[input_column].astype(str).tolist(),
-                dataType,
-                **kwargs
-            )
+        # Send all the columns together to make fewer requests
+        column_results = _extract_columns(_extract.address, df, input, dataType, **kwargs)
+        for output_column, results in zip(output, column_results):
+            df[output_column] = results
   
     return df
 
@@ -172,6 +265,30 @@ def ai(
           Enable strict mode. Default False.
           If True, the function will be required to match the schema,
           but may be more limited in the schema it can return.
+      dedupe:
+        type: boolean
+        description: >-
+          Only send each unique input to the AI once
+          and reuse the result for identical rows. Default True.
+      batch_size:
+        type: integer
+        description: >-
+          The number of rows to send to the AI in each request. Default 1.
+          Larger batches reduce the number of requests and repeated prompts.
+          If a result isn't returned for every row in a batch,
+          those rows are sent again individually.
+      batch_api:
+        type: boolean
+        description: >-
+          Submit all rows using the OpenAI Batch API and wait for the results.
+          This is lower cost than individual requests but can take up to 24 hours.
+          Default False.
+      cache:
+        type: boolean
+        description: >-
+          Reuse the response from an identical earlier request
+          in this session rather than calling the AI again.
+          Default False.
     """
     _logging.info(f": Extracting using AI :: model_id :: {model_id}, input :: {input}")
     # If input is provided, extract only those columns
@@ -235,7 +352,7 @@ def ai(
         target_columns = list(output.keys())
 
     results = _extract.ai(
-        df_temp.to_dict(orient='records'),
+        _records(df_temp),
         api_key=api_key,
         output=output,
         model_id=model_id,
@@ -243,7 +360,11 @@ def ai(
     )
 
     try:
-        exploded_df = _pd.json_normalize(results, max_level=0).fillna('').set_index(df.index)
+        # Only the top level keys are expanded, so the dicts can be passed
+        # to the DataFrame directly rather than copied by json_normalize
+        if not all(isinstance(result, dict) for result in results):
+            raise ValueError("Unexpected response from AI model")
+        exploded_df = _pd.DataFrame(results, index=df.index).fillna('')
 
         if target_columns and len(target_columns) == 1:
             if len(exploded_df.columns) == 1:
@@ -365,7 +486,7 @@ def attributes(
     if len(output) == 1 and len(input) > 1:
         # df[output[0]] = _extract.attributes(df[input].astype(str).aggregate(' AAA '.join, axis=1).tolist())
         df[output[0]] = _extract.attributes(
-            df[input].astype(str).aggregate(' AAA '.join, axis=1).tolist(),
+            _join_columns(df, input, ' AAA '),
             responseContent,
             attribute_type,
             desired_unit,
@@ -374,17 +495,20 @@ def attributes(
             **kwargs
         )
     else:
-        # Loop through and apply for all columns
-        for input_column, output_column in zip(input, output):
-            df[output_column] = _extract.attributes(
-                df[input_column].astype(str).tolist(),
-                responseContent,
-                attribute_type,
-                desired_unit,
-                bound,
-                first_element,
-                **kwargs
-            )
+        # Send all the columns together to make fewer requests
+        column_results = _extract_columns(
+            _extract.attributes,
+            df,
+            input,
+            responseContent,
+            attribute_type,
+            desired_unit,
+            bound,
+            first_element,
+            **kwargs
+        )
+        for output_column, results in zip(output, column_results):
+            df[output_column] = results
         
     return df
 
@@ -447,7 +571,7 @@ def brackets(
 
     # If only only one output and multiple inputs, concatenate the inputs
     if len(output) == 1 and len(input) > 1:
-        df[output[0]] = _extract.brackets(df[input].astype(str).aggregate(' '.join, axis=1).tolist(), find, include_brackets)
+        df[output[0]] = _extract.brackets(_join_columns(df, input, ' '), find, include_brackets)
     else:
         # Loop through and apply for all columns
         for input_column, output_column in zip(input, output):
@@ -528,19 +652,59 @@ def codes(
     _logging.info(f": Extracting codes :: input :: {input}")
     if len(output) == 1 and len(input) > 1:
         df[output[0]] = _extract.codes(
-            df[input].astype(str).aggregate(' AAA '.join, axis=1).tolist(),
+            _join_columns(df, input, ' AAA '),
             **kwargs
         )
     else:
-        # Loop through and apply for all columns
-        for input_column, output_column in zip(input, output):
-            df[output_column] = _extract.codes(
-                df[input_column].astype(str).tolist(),
-                first_element,
+        # Send all the columns together to make fewer requests
+        column_results = _extract_columns(_extract.codes, df, input, first_element, **kwargs)
+        for output_column, results in zip(output, column_results):
+            df[output_column] = results
+
+    return df
+
+
+def _custom_columns(
+    df: _pd.DataFrame,
+    columns: list,
+    model_id: str,
+    use_labels: bool = False,
+    include_empty_labels: bool = True,
+    **kwargs
+) -> list:
+    """
+    Run extract.custom for several columns with the same model.
+    The columns are sent together so the model is only
+    looked up once and requests are batched as fully as possible.
+
+    :param df: Dataframe containing the columns
+    :param columns: List of input columns
+    :param model_id: The model to use for all columns
+    :return: A list of results for each column
+    """
+    # Empty labels are filled based on all the results in a call
+    # so those must stay separate to match the results per column
+    if use_labels and include_empty_labels:
+        return [
+            _extract.custom(
+                df[column].astype(str).tolist(),
+                model_id=model_id,
+                use_labels=use_labels,
+                include_empty_labels=include_empty_labels,
                 **kwargs
             )
+            for column in columns
+        ]
 
-    return df
+    return _extract_columns(
+        _extract.custom,
+        df,
+        columns,
+        model_id=model_id,
+        use_labels=use_labels,
+        include_empty_labels=include_empty_labels,
+        **kwargs
+    )
 
 
 def custom(
@@ -624,25 +788,28 @@ def custom(
     if not isinstance(input, list): input = [input]
     if not isinstance(output, list): output = [output]
     if not isinstance(model_id, list): model_id = [model_id]
+
+    # Check all the model_ids before running any of them
+    for model in model_id:
+        _extract._validate_model_id(model)
     
     if len(input) == len(output) and len(model_id) == 1:
       # if one model_id, then use that model for all columns inputs and outputs
-      model_id = [model_id[0] for _ in range(len(input))]
-      for in_col, out_col, model in zip(input, output, model_id):
-        results = _extract.custom(
-          df[in_col].astype(str).tolist(),
-          model_id=model,
-          first_element=first_element,
-          use_labels=use_labels,
-          case_sensitive=case_sensitive,
-          extract_raw=extract_raw,
-          use_spellcheck=use_spellcheck,
-          include_empty_labels=include_empty_labels,
-          output_format=output_format,
-          sort=sort,
-          **kwargs
-        )
-
+      column_results = _custom_columns(
+        df,
+        input,
+        model_id=model_id[0],
+        first_element=first_element,
+        use_labels=use_labels,
+        case_sensitive=case_sensitive,
+        extract_raw=extract_raw,
+        use_spellcheck=use_spellcheck,
+        include_empty_labels=include_empty_labels,
+        output_format=output_format,
+        sort=sort,
+        **kwargs
+      )
+      for out_col, results in zip(output, column_results):
         if use_labels and output_format == 'columns':
           # Expand list-of-dicts into columns
           try:
@@ -661,27 +828,25 @@ def custom(
           df[out_col] = results
     
     elif len(input) > 1 and len(output) == 1 and len(model_id) == 1:
-        model_id = [model_id[0] for _ in range(len(input))]
         output = output[0]
-        single_model_id = model_id[0]
-        df_temp = _pd.DataFrame(index=range(len(df)))
-        for i, in_col in enumerate(input):
-          results = _extract.custom(
-            df[in_col].astype(str).tolist(),
-            model_id=single_model_id,
-            first_element=first_element,
-            use_labels=use_labels,
-            case_sensitive=case_sensitive,
-            extract_raw=extract_raw,
-            use_spellcheck=use_spellcheck,
-            include_empty_labels=include_empty_labels,
-            output_format=output_format,
-            sort=sort,
-            **kwargs
-          )
-
-          # If requested as columns and use_labels, expand and add with suffix
-          if use_labels and output_format == 'columns':
+        column_results = _custom_columns(
+          df,
+          input,
+          model_id=model_id[0],
+          first_element=first_element,
+          use_labels=use_labels,
+          case_sensitive=case_sensitive,
+          extract_raw=extract_raw,
+          use_spellcheck=use_spellcheck,
+          include_empty_labels=include_empty_labels,
+          output_format=output_format,
+          sort=sort,
+          **kwargs
+        )
+        if use_labels and output_format == 'columns':
+          df_temp = _pd.DataFrame(index=range(len(df)))
+          for i, results in enumerate(column_results):
+            # If requested as columns and use_labels, expand and add with suffix
             try:
               df_exp = _pd.DataFrame(results)
             except Exception:
@@ -694,11 +859,14 @@ def custom(
             # Insert each column with a suffix to keep unique names
             for col in df_exp.columns:
               df_temp[f"{col}{i}"] = df_exp[col].values
-          else:
-            df_temp[output + str(i)] = results
+          rows = df_temp.values.tolist()
+        else:
+          # No expansion needed, so combine the results
+          # row by row without building an intermediate dataframe
+          rows = zip(*column_results)
 
         # Concatenate the results into a single column
-        df[output] = [list(dict.fromkeys(_format.concatenate([x for x in row if x], ' '))) for row in df_temp.values.tolist()]
+        df[output] = [list(dict.fromkeys(_format.concatenate([x for x in row if x], ' '))) for row in rows]
 
     else:
         # Iterate through the inputs, outputs and model_ids
@@ -736,6 +904,19 @@ def custom(
     return df
 
 
+# Functions to get each supported property from a datetime series
+_date_properties = {
+    'day': lambda x: x.dt.day,
+    'day_of_year': lambda x: x.dt.day_of_year,
+    'month': lambda x: x.dt.month,
+    'month_name': lambda x: x.dt.month_name(),
+    'weekday': lambda x: x.dt.weekday,
+    'week_day_name': lambda x: x.dt.day_name(),
+    'week_year': lambda x: x.dt.isocalendar()['week'],
+    'quarter': lambda x: x.dt.quarter,
+}
+
+
 def date_properties(df: _pd.DataFrame, input: _pd.Timestamp, property: str, output: str = None) -> _pd.DataFrame:
     """
     type: object
@@ -780,62 +961,44 @@ def date_properties(df: _pd.DataFrame, input: _pd.Timestamp, property: str, outp
     if len(input) != len(output) and len(output) > 1:
         raise ValueError('Extract must output to a single column or equal amount of columns as input.')
 
-    _logging.debug(f": Extracting date property :: {property} from {input}")
-    if len(output) == 1 and len(input) > 1:
-        output = [output[0] for i in range(len(input))]
-        # df_temp = df[input].apply(_pd.to_datetime)
-        temp = []
-        # for i in range(len(input)):
-            # Loop through and apply for all columns
-        for input_column, output_column in zip(input, output):
-            # Converting data to datetime
-            df_temp = _pd.to_datetime(df[input_column])
-            
-            properties_object = {
-                'day': df_temp.dt.day,
-                'day_of_year': df_temp.dt.day_of_year,
-                'month': df_temp.dt.month,
-                'month_name': df_temp.dt.month_name(),
-                'weekday': df_temp.dt.weekday,
-                'week_day_name': df_temp.dt.day_name(),
-                'week_year': df_temp.dt.isocalendar()['week'],
-                'quarter': df_temp.dt.quarter,
-            }
-            
-            if property in properties_object.keys() and temp == []:
-                temp.append([properties_object[property][0]])
+    # Check the property is valid before converting any data
+    if property not in _date_properties:
+        raise ValueError(f"\"{property}\" not a valid date property.")
+    get_property = _date_properties[property]
 
-            elif property in properties_object.keys() and temp != []:
-                for j in range(len(df)):
-                    temp[j].append(properties_object[property][0])
+    _logging.debug(f": Extracting date property :: {property} from {input}")
+    # Only get the property once for each input column, even if repeated
+    properties = {}
+    def _column_property(input_column):
+        if input_column not in properties:
+            properties[input_column] = get_property(_pd.to_datetime(df[input_column]))
+        return properties[input_column]
 
-            else:
-                raise ValueError(f"\"{property}\" not a valid date property.")
-        df[output[0]] = temp
+    if len(output) == 1 and len(input) > 1:
+        # Collect the property from each input as a list per row
+        values = [
+            _column_property(input_column).tolist()
+            for input_column in input
+        ]
+        df[output[0]] = [list(row) for row in zip(*values)]
     else:
         # Loop through and apply for all columns
         for input_column, output_column in zip(input, output):
-            # Converting data to datetime
-            df_temp = _pd.to_datetime(df[input_column])
-            
-            properties_object = {
-                'day': df_temp.dt.day,
-                'day_of_year': df_temp.dt.day_of_year,
-                'month': df_temp.dt.month,
-                'month_name': df_temp.dt.month_name(),
-                'weekday': df_temp.dt.weekday,
-                'week_day_name': df_temp.dt.day_name(),
-                'week_year': df_temp.dt.isocalendar()['week'],
-                'quarter': df_temp.dt.quarter,
-            }
-            
-            if property in properties_object.keys():
-                df[output_column] = properties_object[property]
-            else:
-                raise ValueError(f"\"{property}\" not a valid date property.")
+            df[output_column] = _column_property(input_column)
     return df
 
 
+# Frequencies for date_range with a fixed length
+# that can be counted without generating the range
+_date_range_fixed_units = {
+    'days': '1D',
+    'hours': '1h',
+    'minutes': '1min',
+    'seconds': '1s',
+    'milliseconds': '1ms',
+}
+
+
 def date_range(df: _pd.DataFrame, start_time: _pd.Timestamp, end_time: _pd.Timestamp, output: str, range: str = 'day') -> _pd.DataFrame:
     """
     type: object
@@ -904,16 +1067,37 @@ def date_range(df: _pd.DataFrame, start_time: _pd.Timestamp, end_time: _pd.Times
         raise ValueError(f"\"{range}\" not a valid frequency")
         
     # Converting data to datetime
-    df[start_time] = _pd.to_datetime(df[start_time])
-    df[end_time] = _pd.to_datetime(df[end_time])
+    df[start_time] = _pd.to_datetime(df[start_time], cache=True)
+    df[end_time] = _pd.to_datetime(df[end_time], cache=True)
         
-    # Removing timezone information from columns before operation
-    start_data = df[start_time].dt.tz_localize(None).copy()
-    end_date = df[end_time].dt.tz_localize(None).copy()
+    # Removing timezone information from columns before operation.
+    # Naive columns are used as is to avoid copying them
+    start_data = df[start_time]
+    if start_data.dt.tz is not None:
+        start_data = start_data.dt.tz_localize(None)
+    end_date = df[end_time]
+    if end_date.dt.tz is not None:
+        end_date = end_date.dt.tz_localize(None)
     
+    if (
+        range in _date_range_fixed_units and
+        not (start_data.isna().any() or end_date.isna().any())
+    ):
+        # Fixed length frequencies start from the start date,
+        # so the count is the number of whole units between the dates
+        df[output] = (
+            (end_date - start_data) // _pd.Timedelta(_date_range_fixed_units[range])
+        ).clip(lower=0).values
+        return df
+
+    # Generating a date range is expensive, so only
+    # count each unique pair of dates once
+    counts = {}
     results = []
     for start, end in zip(start_data, end_date):
-        results.append(len(_pd.date_range(start, end, freq=range_object[range])[1:]))
+        if (start, end) not in counts:
+            counts[(start, end)] = len(_pd.date_range(start, end, freq=range_object[range])[1:])
+        results.append(counts[(start, end)])
     
     df[output] = results
     
@@ -969,12 +1153,16 @@ def html(
 
     _logging.debug(f": Extracting from HTML :: input :: {input}")
     # Loop through and apply for all columns
-    for input_column, output_column in zip(input, output):
-        df[output_column] = _extract.html(
-            df[input_column].astype(str).tolist(),
-            dataType=data_type,
-            **kwargs
-        )
+    # Send all the columns together to make fewer requests
+    column_results = _extract_columns(
+        _extract.html,
+        df,
+        [input_column for input_column, _ in zip(input, output)],
+        dataType=data_type,
+        **kwargs
+    )
+    for output_column, results in zip(output, column_results):
+        df[output_column] = results
             
     return df
 
@@ -1038,22 +1226,25 @@ def properties(
     _logging.info(f": Extracting properties :: input :: {input}")
     if len(output) == 1 and len(input) > 1:
         df[output[0]] = _extract.properties(
-            df[input].astype(str).aggregate(' '.join, axis=1).tolist(),
+            _join_columns(df, input, ' '),
             type=property_type,
             return_data_type=return_data_type,
             first_element=first_element,
             **kwargs
         )
     else:
-        # Loop through and apply for all columns
-        for input_column, output_column in zip(input, output):
-            df[output_column] = _extract.properties(
-                df[input_column].astype(str).tolist(),
-                type=property_type,
-                return_data_type=return_data_type,
-                first_element=first_element,
-                **kwargs
-            )
+        # Send all the columns together to make fewer requests
+        column_results = _extract_columns(
+            _extract.properties,
+            df,
+            input,
+            type=property_type,
+            return_data_type=return_data_type,
+            first_element=first_element,
+            **kwargs
+        )
+        for output_column, results in zip(output, column_results):
+            df[output_column] = results
     
     return df
 
@@ -1115,30 +1306,35 @@ def regex(
     _logging.debug(f": Extracting regex patterns :: input :: {input}")
     find_pattern = _re.compile(find)
 
+    if output_pattern is None:
+        # Return entire matches
+        def _format_match(match):
+            return match.group(0)
+    else:
+        # Return specific capture groups in the pattern the were passed
+        def _format_match(match):
+            return find_pattern.sub(output_pattern, match.group(0))
+
+    if first_element:
+        # Only the first match is needed so stop searching once found
+        def _extract_value(value):
+            match = find_pattern.search(str(value) if value is not None else "")
+            return _format_match(match) if match else ""
+    elif output_pattern is None and find_pattern.groups == 0:
+        # Without groups, findall returns the entire matches
+        # and builds the list without a Python call per match
+        def _extract_value(value):
+            return find_pattern.findall(str(value) if value is not None else "")
+    else:
+        def _extract_value(value):
+            return [
+                _format_match(match)
+                for match in find_pattern.finditer(str(value) if value is not None else "")
+            ]
+
     # Loop through and apply for all columns
     for input_column, output_column in zip(input, output):
-        if output_pattern is None and first_element:
-            # Return entire matches
-            df[output_column] = df[input_column].apply(
-                lambda x: ([match.group(0) for match in _re.finditer(find_pattern, str(x) if x is not None else "")][0]
-                           if len([match.group(0) for match in _re.finditer(find_pattern, str(x) if x is not None else "")]) >= 1
-                           else "")
-                          )
-        elif output_pattern is None and not first_element:
-            # Return entire matches
-            df[output_column] = df[input_column].apply(lambda x: [match.group(0) for match in _re.finditer(find_pattern, str(x) if x is not None else "")])
-        elif output_pattern and first_element:
-            # Return specific capture groups in the pattern the were passed
-            df[output_column] = df[input_column].apply(
-                lambda x: (
-                    [find_pattern.sub(output_pattern, match.group(0)) for match in find_pattern.finditer(str(x) if x is not None else "")][0]
-                    if len([find_pattern.sub(output_pattern, match.group(0)) for match in find_pattern.finditer(str(x) if x is not None else "")]) >= 1
-                    else ""
-                    )
-                )
-        else:
-            # Return specific capture groups in the pattern the were passed
-            df[output_column] = df[input_column].apply(lambda x: [find_pattern.sub(output_pattern, match.group(0)) for match in find_pattern.finditer(str(x) if x is not None else "")])
+        df[output_column] = [_extract_value(x) for x in df[input_column].tolist()]
 
     return df
 
@@ -47,8 +47,10 @@ def dates(df: _pd.DataFrame, input: _Union[str, int, list], format: str, output:
     _logging.debug(f": Formatting dates :: format :: {format}, input :: {input}")
     # Loop through and apply for all columns
     for input_column, output_column in zip(input, output):
-        # convert the column to timestamp type and format date
-        df[output_column] = _pd.to_datetime(df[input_column]).dt.strftime(format)
+        # Dates are often repeated, so convert and format
+        # each distinct value once then map back to the rows
+        codes, uniques = _pd.factorize(df[input_column], use_na_sentinel=False)
+        df[output_column] = _pd.to_datetime(uniques).strftime(format).to_numpy()[codes]
     
     return df
     
@@ -179,7 +181,7 @@ def prefix(
     # Loop through and apply for all columns
     for input_column, output_column in zip(input, output):
         if skip_empty:
-          df[output_column] = df[input_column].apply(lambda x: value + x if x else x)
+          df[output_column] = [value + x if x else x for x in df[input_column].tolist()]
         else:  
           df[output_column] = str(value) + df[input_column].astype(str)
 
@@ -321,7 +323,7 @@ def suffix(
     # Loop through and apply for all columns
     for input_column, output_column in zip(input, output):
         if skip_empty:
-          df[output_column] = df[input_column].apply(lambda x: x + value if x else x)
+          df[output_column] = [x + value if x else x for x in df[input_column].tolist()]
         else:  
           df[output_column] = df[input_column].astype(str) + str(value)
   
@@ -368,7 +370,18 @@ def trim(df: _pd.DataFrame, input: _Union[str, int, list], output: _Union[str, l
 
     # Loop through all requested columns
     for input_column, output_column in zip(input, output):
-        df[output_column] = df[input_column].apply(lambda x: _safe_str_transform(x, "strip", warnings))
+        dtype = df[input_column].dtype
+        if isinstance(dtype, _pd.StringDtype) and dtype.storage == 'pyarrow':
+            # Arrow backed strings can be stripped with a native kernel
+            df[output_column] = df[input_column].str.strip()
+            continue
+
+        # Strip strings directly and only fall back to the
+        # safe transform to warn about non-string values
+        df[output_column] = [
+            x.strip() if isinstance(x, str) else _safe_str_transform(x, "strip", warnings)
+            for x in df[input_column].tolist()
+        ]
 
     return df
     
@@ -379,5 +392,10 @@ def price_breaks(df: _pd.DataFrame, input: list, categoryLabel: str, valueLabel:
     Rearrange price breaks
     """
     _logging.info(f": Processing price breaks :: input :: {input}")
-    df = _pd.concat([df, _format.price_breaks(df[input], categoryLabel, valueLabel)], axis=1)
+    results = _format.price_breaks(df[input], categoryLabel, valueLabel)
+
+    # Assign the new columns by position rather than concatenating,
+    # which copies the whole dataframe and aligns on the index
+    for column in results.columns:
+        df[column] = results[column].values
     return df
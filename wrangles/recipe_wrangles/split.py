@@ -79,21 +79,29 @@ def dictionary(
 
     def _parse_dict_or_json(val):
         if isinstance(val, dict):
-            return val.items()
+            return val
         elif isinstance(val, str) and val.startswith('{') and val.endswith('}'):
             try:
-                return _json.loads(val).items()
+                return _json.loads(val)
             except:
                 pass
         raise ValueError(f'{val} is not a valid Dictionary') from None
-        
 
-    # Merge each row's dictionaries so duplicate keys follow existing behavior:
-    # later input columns overwrite earlier input columns.
-    dicts = [
-        dict(_itertools.chain.from_iterable(_parse_dict_or_json(d) for d in ([default] + row.tolist())))
-        for row in df[input].values
-    ]
+    default = _parse_dict_or_json(default)
+    columns = [df[column].tolist() for column in input]
+
+    if len(input) == 1 and not default:
+        # Nothing to merge, so use each row's dictionary as is
+        dicts = [_parse_dict_or_json(d) for d in columns[0]]
+    else:
+        # Merge each row's dictionaries so duplicate keys follow existing behavior:
+        # later input columns overwrite earlier input columns.
+        dicts = []
+        for row in zip(*columns):
+            merged = dict(default)
+            for d in row:
+                merged.update(_parse_dict_or_json(d))
+            dicts.append(merged)
 
     if output_format == "to_lists":
         if output is None:
@@ -136,7 +144,17 @@ def dictionary(
         # Return only the named output columns
         df_temp = df_temp[output.values()]
 
-    df[df_temp.columns] = df_temp.values
+    if df_temp.columns.is_unique:
+        # Assign the columns directly, aligned to the input's index. This
+        # avoids building a single 2D array of the whole frame. Mixed
+        # types are cast to the common type that array would have used,
+        # e.g. float for ints and floats, found from an empty slice
+        if df_temp.dtypes.nunique() > 1:
+            df_temp = df_temp.astype(df_temp.iloc[:0].to_numpy().dtype)
+        df_temp.index = df.index
+        df[df_temp.columns] = df_temp
+    else:
+        df[df_temp.columns] = df_temp.values
 
     return df
 
@@ -175,11 +193,14 @@ def list(df: _pd.DataFrame, input: _Union[str, int], output: _Union[str, _list])
         return df
     # Generate results and pad to a consistent length
     # as long as the max length
-    max_len = max([len(x) for x in results])
-    results = [
-        x + [''] * (max_len - len(x))
-        for x in results
-    ]
+    lengths = [len(x) for x in results]
+    max_len = max(lengths)
+    padded = min(lengths) != max_len
+    if padded:
+        results = [
+            x + [''] * (max_len - length)
+            for x, length in zip(results, lengths)
+        ]
 
     # Handle wildcard cases and column assignment
     if (isinstance(output, str) and '*' in output) or (isinstance(output, _list) and len(output) == 1 and '*' in output[0]):
@@ -188,7 +209,10 @@ def list(df: _pd.DataFrame, input: _Union[str, int], output: _Union[str, _list])
         output_headers = [wildcard_template.replace('*', str(i)) for i in range(1, len(results[0]) + 1)]
         df[output_headers] = results
     else:
-        # Direct assignment for single column
+        # Direct assignment for single column. Rows that weren't
+        # padded are copied so the cells aren't shared with the input
+        if not padded and isinstance(output, str):
+            results = [x.copy() for x in results]
         df[output] = results
 
     return df
@@ -2,6 +2,7 @@
 Train new models
 """
 from typing import Union as _Union
+from collections.abc import Iterator as _Iterator
 from . import config as _config
 from . import auth as _auth
 from . import utils as _utils
@@ -23,9 +24,13 @@ class train():
         :param name: If provided, will create a new model with this name.
         :param model_id: If provided, will update this model.
         """
+        # Accept any iterable of rows, such as a generator, reading it only once
+        if isinstance(training_data, (tuple, _Iterator)):
+            training_data = list(training_data)
+
         # If input is a list, check to make sure that all sublists are length of 2
         if isinstance(training_data, list):
-            check_index = [training_data.index(x) for x in training_data if len(x) != 3 or '' in x[:2]]
+            check_index = [i for i, x in enumerate(training_data) if len(x) != 3 or '' in x[:2]]
             if len(check_index) != 0:
                 raise ValueError(f'Training_data list must contain a list of two non-empty elements, plus optional Notes. Check element(s) {check_index} in training_list.\nFormat:\nFirst element is "Example"\nSecond Element is "Category" -- \'\' is not valid.\n'
                 "Example:[['Rice', 'Grain', '']]")
@@ -81,10 +86,14 @@ class train():
         :param name: If provided, will create a new model with this name.
         :param model_id: If provided, will update this model.
         """
+        # Accept any iterable of rows, such as a generator, reading it only once
+        if isinstance(training_data, (tuple, _Iterator)):
+            training_data = list(training_data)
+
         # If input is a list, check to make sure that all sublists are length of 2
         # Must have both values filled ('' counts as filled, None does not count)
         if isinstance(training_data, list) and variant in (None, 'pattern'):
-            check_index = [training_data.index(x) for x in training_data if len(x) != 3]
+            check_index = [i for i, x in enumerate(training_data) if len(x) != 3]
             if len(check_index) != 0: # If an index does not have len() of 2 then raise error
                 raise ValueError(f"Training_data list must contain a list of two elements, plus optional Notes. Check element(s) {check_index} in training_list.\nFormat:\nFirst element is 'Entity to Find'\nSecond Element is 'Variation', If no variation, use \'\'\n"
                 "Example:[['Television', 'TV', '']]")
@@ -95,7 +104,7 @@ class train():
         # If input is a list, check to make sure that all sublists are length of 7
         # Must have all values filled ('' counts as filled, None does not count)
         if isinstance(training_data, list) and variant == 'extract-ai':
-            check_index = [training_data.index(x) for x in training_data if len(x) != 7]
+            check_index = [i for i, x in enumerate(training_data) if len(x) != 7]
             if len(check_index) != 0: # If an index does not have len() of 6 then raise error
                 raise ValueError(f"Training_data list must contain a list of six elements, plus optional Notes. Check element(s) {check_index} in training_list.\nFormat:\nFirst element is 'Find'\nSecond Element is 'Description', If no variation, use \'\'\n"
                 # This example needs to be updated with the 5 other columns
@@ -270,9 +279,13 @@ class train():
         :param name: If provided, will create a new model with this name.
         :param model_id: If provided, will update this model.
         """
+        # Accept any iterable of rows, such as a generator, reading it only once
+        if isinstance(training_data, (tuple, _Iterator)):
+            training_data = list(training_data)
+
         # If input is a list, check to make sure that all sublists are length of 2
         if isinstance(training_data, list):
-            check_index = [training_data.index(x) for x in training_data if len(x) != 3]
+            check_index = [i for i, x in enumerate(training_data) if len(x) != 3]
             if len(check_index) != 0:
                 raise ValueError(f'Training_data list must contain a list of two elements, plus optional Notes. Check element(s) {check_index} in training_list.\nFormat:\nFirst element is "Entity to Find"\nSecond Element is "Variation", If no variation, use \'\'\n'
                 "Example:[['USA', 'United States of America', '']]")
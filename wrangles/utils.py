@@ -9,12 +9,17 @@ import requests as _requests
 from urllib3.util import Retry as _Retry
 import typing as _typing
 import json as _json
+import weakref as _weakref
 try:
     from yaml import CSafeLoader as _YamlLoader
 except ImportError:
     from yaml import SafeLoader as _YamlLoader
 
 
+# Pattern matching templated variables ${<something here>}
+_variable_pattern = _re.compile(r"\$\{[^\}]+\}")
+
+
 def wildcard_expansion_dict(all_columns: list, selected_columns: dict) -> list:
     """
     Finds matching columns for wildcards or regex from all available columns
@@ -32,18 +37,13 @@ def wildcard_expansion_dict(all_columns: list, selected_columns: dict) -> list:
         if _re.search(r'[^\\]?\*', str(k)) and not str(k).lower().startswith('regex:'):
             # Convert wildcard to a regex pattern for key
             k = 'regex:' + _re.sub(r'(?<!\\)\*', r'(.*)', k)
-            # Convert wildcard to a regex pattern for value
-            group_counter = [0]
-            def replacer(_):
-                """
-                Increment group number using a mutable object
-                each time this function is called to give
-                a unique capture group number for each wildcard
-                """
-                # Use the current counter value, then increment it
-                group_counter[0] += 1                
-                return fr'\g<{group_counter[0]}>'
-            v = _re.sub(r'(?<!\\)\*', replacer, v)
+            # Convert wildcard to a regex pattern for value,
+            # giving each wildcard a unique capture group number
+            parts = _re.split(r'(?<!\\)\*', v)
+            v = parts[0] + ''.join(
+                fr'\g<{i}>' + part
+                for i, part in enumerate(parts[1:], start=1)
+            )
             tmp_columns[k] = v
         else:
             tmp_columns[k] = v
@@ -56,17 +56,22 @@ def wildcard_expansion_dict(all_columns: list, selected_columns: dict) -> list:
     # Identify any matching columns using regex within the list
     for column in selected_columns:
         if column.lower().startswith('regex:'):
+            # Compile the pattern once rather than for every column
+            pattern = column[6:].strip()
+            matches = _re.compile(pattern).fullmatch
             # result_columns.update() # Read Note below
-            matching_columns = dict.fromkeys(list(
-                filter(_re.compile(column[6:].strip()).fullmatch, all_columns)
-            ))
+            matching_columns = dict.fromkeys(
+                col for col in all_columns if matches(col)
+            )
             try:
                 if column == selected_columns[column]:
-                    # If the column is not renamed, maintain the original matching column names
-                    renamed_columns = [_re.sub("(" + column[6:].strip() + ")", r"\1", col, count=1) for col in matching_columns]
+                    # If the column is not renamed, maintain the original matching column names.
+                    # Replacing a match with itself is a no-op, so no substitution is needed
+                    renamed_columns = list(matching_columns)
                 else:
                     # Else rename the columns using the provided regex pattern
-                    renamed_columns = [_re.sub(column[6:].strip(), selected_columns[column], col, count=1) for col in matching_columns]
+                    rename = _re.compile(pattern)
+                    renamed_columns = [rename.sub(selected_columns[column], col, count=1) for col in matching_columns]
             except _re.error as e:
                 raise ValueError(f"Invalid regex pattern: {selected_columns[column]}. Are you missing a capture group?") from None
             
@@ -128,17 +133,22 @@ def get_nested_function(
             fn_list.append(default_stock_functions)
 
         if custom_functions:
-            obj = {
-                name: getattr(stock_functions, name)
-                for name in dir(stock_functions)
-                if isinstance(
-                    getattr(stock_functions, name),
-                    (_types.FunctionType, _types.ModuleType, type)
-                )
-                and not name.startswith("_")
-            }
-
-            obj = {**obj, **custom_functions}
+            # Custom functions take priority over public stock functions.
+            # Only the first name needs resolving, so look it up directly
+            # rather than building a dict of every stock function.
+            if fn_list[0] in custom_functions:
+                obj = custom_functions
+            else:
+                stock_function = getattr(stock_functions, fn_list[0], None)
+                if (
+                    fn_list[0].startswith("_") or
+                    not isinstance(
+                        stock_function,
+                        (_types.FunctionType, _types.ModuleType, type)
+                    )
+                ):
+                    raise ValueError(f'Function {fn_string} not recognized')
+                obj = {fn_list[0]: stock_function}
         else:
             obj = stock_functions
 
@@ -180,6 +190,33 @@ def validate_function_args(
         raise ValueError(f"Function '{name}' requires arguments: {missing_args}")
 
 
+# Argument names of functions that have already been inspected.
+# Held weakly so caching doesn't keep user functions alive.
+_function_args_cache = _weakref.WeakKeyDictionary()
+
+
+def _function_args(fn: _types.FunctionType) -> frozenset:
+    """
+    Get the names of a function's arguments.
+    Cached as inspecting a function is relatively slow
+    and the same functions are used for every recipe run.
+
+    :param fn: Function to inspect
+    """
+    try:
+        return _function_args_cache[fn]
+    except (KeyError, TypeError):
+        pass
+
+    args = frozenset(_inspect.getfullargspec(fn).args)
+    try:
+        _function_args_cache[fn] = args
+    except TypeError:
+        # Some callables can't be weakly referenced
+        pass
+    return args
+
+
 def add_special_parameters(
     params: dict,
     fn: _types.FunctionType,
@@ -206,7 +243,7 @@ def add_special_parameters(
     if common_params is None:
         common_params = {}
     # Check args and pass on special parameters if requested
-    argspec = _inspect.getfullargspec(fn).args
+    argspec = _function_args(fn)
     if ("functions" not in params and "functions" in argspec):
         params['functions'] = functions
     if ("variables" not in params and "variables" in argspec):
@@ -343,16 +380,18 @@ def wildcard_expansion(all_columns: list, selected_columns: _Union[str, list]) -
             pattern = column[6:].strip() 
             if pattern.startswith("-"):
                 # Remove columns that match the negative regex pattern
+                excluded = _re.compile(pattern[1:]).fullmatch
                 result_columns = {
                     k: None
                     for k in result_columns
-                    if not _re.compile(pattern[1:]).fullmatch(k)
+                    if not excluded(k)
                 }
             else:
                 # Add columns that match the regex pattern
-                result_columns.update(dict.fromkeys(list(
-                    filter(_re.compile(pattern).fullmatch, all_columns)
-                ))) # Read Note below
+                matches = _re.compile(pattern).fullmatch
+                result_columns.update(dict.fromkeys(
+                    col for col in all_columns if matches(col)
+                )) # Read Note below
             
             continue
 
@@ -570,11 +609,8 @@ def replace_templated_values(
         # Search string for one or more variables to replace
         new_recipe_object = recipe_object
 
-        # Pattern matching ${<something here>}
-        variable_pattern = _re.compile(r"\$\{[^\}]+\}")
-
         # Whole string is a variable
-        if variable_pattern.fullmatch(new_recipe_object):
+        if _variable_pattern.fullmatch(new_recipe_object):
             try:
                 replacement_value = variables[new_recipe_object[2:-1]]
             except:
@@ -620,17 +656,17 @@ def replace_templated_values(
 
         # Variable is found within the string e.g. file-${number}.csv
         # Since this is within a string, the type is forced to also be a string
-        elif variable_pattern.search(new_recipe_object):
-            for var in variable_pattern.findall(new_recipe_object):
+        elif "${" in new_recipe_object:
+            def _replace_variable(match):
+                var = match.group(0)
                 try:
-                    replacement_value = variables[var[2:-1]]
-                except:
+                    return str(variables[var[2:-1]])
+                except KeyError:
                     if ignore_unknown_variables:
-                        replacement_value = var
-                    else:
-                        raise ValueError(f"Variable {var} was not found.")
+                        return var
+                    raise ValueError(f"Variable {var} was not found.")
 
-                new_recipe_object = new_recipe_object.replace(var, str(replacement_value))
+            new_recipe_object = _variable_pattern.sub(_replace_variable, new_recipe_object)
 
     # Otherwise, just return unchanged    
     else: